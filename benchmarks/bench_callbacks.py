@@ -0,0 +1,87 @@
+"""
+Benchmarks des callbacks de figures de main.py, appelés comme de simples
+fonctions. Les caches de calcul sont vidés à chaque appel (coût à froid) ;
+les méthodes track_* enregistrent la taille de la réponse sérialisée (figure
+complète ou mise à jour partielle dash.Patch).
+
+dt est fixé par chaque callback : la grille porte sur (a1, a2, x0, y0, t_max),
+dt est couvert par bench_computation.
+"""
+from benchmarks.common import COEFFICIENTS, INITIAL_CONDITIONS, HORIZONS, payload_bytes
+
+from computation.cache import vider_caches
+
+
+class Callbacks:
+    def setup(self, *params):
+        import main
+        self.main = main
+
+
+class TimeStabilityTrajectory(Callbacks):
+    params = [COEFFICIENTS, INITIAL_CONDITIONS, HORIZONS]
+    param_names = ['(a1, a2)', '(x0, y0)', 't_max']
+
+    def _call(self, coefficients, ci, t_max):
+        vider_caches()
+        return self.main.update_stability_trajectory(*coefficients, *ci, t_max)
+
+    def time_update_stability_trajectory(self, *params):
+        self._call(*params)
+
+    def track_payload_bytes(self, *params):
+        return payload_bytes(self._call(*params))
+    track_payload_bytes.unit = 'bytes'
+
+
+class TimePhasePortrait(Callbacks):
+    params = [COEFFICIENTS]
+    param_names = ['(a1, a2)']
+
+    def _call(self, coefficients):
+        vider_caches()
+        return self.main.update_phase_portrait(*coefficients)
+
+    def time_update_phase_portrait(self, *params):
+        self._call(*params)
+
+    def track_payload_bytes(self, *params):
+        return payload_bytes(self._call(*params))
+    track_payload_bytes.unit = 'bytes'
+
+
+class TimeScenarioVisualization(Callbacks):
+    # (-2, -0.5) et (-2, -1) sont les valeurs prédéfinies, servies par le cache de figures
+    params = [['ship', 'door'], COEFFICIENTS + [(-2.0, -0.5), (-2.0, -1.0)], [False, True]]
+    param_names = ['scénario', '(a1, a2)', 'navigateur']
+
+    def _call(self, scenario, coefficients, client_side):
+        vider_caches()
+        return self.main.update_scenario_visualization(scenario, *coefficients, 1.0, 0.0, client_side)
+
+    def time_update_scenario_visualization(self, *params):
+        self._call(*params)
+
+    def track_payload_bytes(self, *params):
+        return payload_bytes(self._call(*params))
+    track_payload_bytes.unit = 'bytes'
+
+
+class TimeStabilityMap(Callbacks):
+    params = [[100, 250, 500, 1000]]
+    param_names = ['résolution']
+
+    def _call(self, resolution):
+        vider_caches()
+        self.main._map_traces.clear()
+        return self.main.update_stability_map(resolution, -1.0, -0.5)
+
+    def time_update_stability_map(self, resolution):
+        self._call(resolution)
+
+    def time_update_stability_map_point(self, resolution):
+        self.main.update_stability_map_point(-1.0, -0.5)
+
+    def track_payload_bytes(self, resolution):
+        return payload_bytes(self._call(resolution))
+    track_payload_bytes.unit = 'bytes'
@@ -0,0 +1,146 @@
+"""
+Benchmarks des fonctions de calcul (style asv : classes avec params,
+setup et méthodes time_*). Les appels contournent le cache de calcul pour
+mesurer le coût réel de l'intégration.
+"""
+from benchmarks.common import COEFFICIENTS, INITIAL_CONDITIONS, TIME_STEPS, HORIZONS
+
+from computation import phase, perturbation, rasterisation, stabilite
+
+
+class TimeChamp:
+    params = [COEFFICIENTS, [20, 60, 200]]
+    param_names = ['(a1, a2)', 'densité']
+
+    def time_calculer_champ(self, coefficients, densite):
+        a1, a2 = coefficients
+        phase.calculer_champ(a1, a2, (-5, 5), (-5, 5), n=densite)
+
+    def time_segments_champ(self, coefficients, densite):
+        a1, a2 = coefficients
+        X, Y, U, V = phase.calculer_champ(a1, a2, (-5, 5), (-5, 5), n=densite)
+        phase.segments_champ(X, Y, U, V, echelle=6 / densite)
+
+
+class TimeTrajectoire:
+    params = [COEFFICIENTS, INITIAL_CONDITIONS, list(phase.INTEGRATEURS)]
+    param_names = ['(a1, a2)', '(x0, y0)', 'méthode']
+
+    def time_calculer_trajectoire(self, coefficients, ci, methode):
+        a1, a2 = coefficients
+        phase.calculer_trajectoires.__wrapped__(a1, a2, [ci], 10, methode)
+
+
+class TimeTrajectoiresBatch:
+    params = [[4, 100, 1000]]
+    param_names = ['N']
+
+    def setup(self, n):
+        import numpy as np
+        self.ci = np.random.default_rng(0).uniform(-5, 5, (n, 2))
+
+    def time_calculer_trajectoires(self, n):
+        phase.calculer_trajectoires.__wrapped__(-1.0, -0.5, self.ci)
+
+
+class TimePerturbation:
+    params = [COEFFICIENTS, INITIAL_CONDITIONS, TIME_STEPS, HORIZONS, ['odeint', 'exacte', 'adaptative']]
+    param_names = ['(a1, a2)', '(x0, y0)', 'dt', 't_max', 'méthode']
+
+    def time_calcul_perturbation(self, coefficients, ci, dt, t_max, methode):
+        a1, a2 = coefficients
+        x0, y0 = ci
+        perturbation.calcul_perturbation.__wrapped__(a1, a2, x0, y0, 1e-3, t_max, dt, methode)
+
+
+class TrackPropagateurLongHorizon:
+    # systèmes amortis sur t_max=500 : e^(m t) sous-dépasse quand cosh(s t) déborde
+    params = [[(-1.0, -5.0), (-2.0, -3.0)], [500.0], ['exacte', 'odeint']]
+    param_names = ['(a1, a2)', 't_max', 'méthode']
+
+    def track_echantillons_non_finis(self, coefficients, t_max, methode):
+        """Nombre de valeurs non finies de ||Δ||(t) ; échoue s'il y en a"""
+        import numpy as np
+
+        a1, a2 = coefficients
+        *_, dist = perturbation.calcul_perturbation.__wrapped__(a1, a2, 1.0, 0.0, 1e-3, t_max, 0.05, methode)
+        non_finis = int(np.count_nonzero(~np.isfinite(dist)))
+        assert non_finis == 0, f'{non_finis} distances non finies pour {coefficients}, {methode}'
+        return non_finis
+    track_echantillons_non_finis.unit = 'échantillons'
+
+
+class TimeCarteStabilite:
+    params = [[100, 250, 500, 1000]]
+    param_names = ['résolution']
+
+    def time_carte_stabilite(self, resolution):
+        stabilite.carte_stabilite.__wrapped__(resolution)
+
+
+class TimeEnsemblePerturbation:
+    params = [[1000, 10000], HORIZONS, ['aleatoire', 'structurees']]
+    param_names = ['N', 't_max', 'directions']
+
+    def time_ensemble_perturbation(self, n, t_max, directions):
+        perturbation.ensemble_perturbation.__wrapped__(-1.0, 0.2, 1e-3, n, t_max, 0.05, directions)
+
+
+class TrackEnsemblePercentiles:
+    # (-1, -4), (2, 0), (1, -0.5) : σ_min << σ_max ; (2, 1) à t_max=100 : σ_max ~ 1e77
+    params = [COEFFICIENTS + [(-1.0, -4.0), (2.0, 0.0), (1.0, -0.5)], HORIZONS]
+    param_names = ['(a1, a2)', 't_max']
+
+    def track_ecart_percentiles(self, coefficients, t_max):
+        """
+        Écart maximal (en décades) entre les bandes de l'histogramme et
+        np.percentile des distances explicites ; échoue au-delà d'une classe
+        (inverted_cdf : l'échantillon que l'histogramme situe dans sa classe).
+        """
+        import numpy as np
+        from computation.propagateur import exponentielle
+
+        a1, a2 = coefficients
+        eps, n, classes = 1e-3, 1000, 256
+        t, bandes, _ = perturbation.ensemble_perturbation.__wrapped__(a1, a2, eps, n, t_max, classes=classes)
+
+        angles = np.random.default_rng(0).uniform(0, 2*np.pi, n)
+        phi = exponentielle(a1, a2, t)
+        with np.errstate(over='ignore', invalid='ignore'):
+            distances = eps * np.hypot(phi[:, 0, 0, None]*np.cos(angles) + phi[:, 0, 1, None]*np.sin(angles),
+                                       phi[:, 1, 0, None]*np.cos(angles) + phi[:, 1, 1, None]*np.sin(angles))
+            reference = np.percentile(distances, (5.0, 50.0, 95.0), axis=1, method='inverted_cdf')
+            ecart = np.abs(np.log10(bandes / reference))
+            sigma = np.linalg.svd(phi, compute_uv=False)
+            classe = np.log10(sigma[:, 0] / sigma[:, 1]) / classes
+
+        calculable = np.isfinite(reference).all(axis=0) & (reference > 0).all(axis=0)
+        assert np.isfinite(bandes[:, calculable]).all(), f'bandes non finies pour {coefficients}'
+        assert (ecart[:, calculable] <= classe[calculable] + 1e-9).all(), f'bandes hors d\'une classe pour {coefficients}'
+        return float(ecart[:, calculable].max())
+    track_ecart_percentiles.unit = 'décades'
+
+
+class TimePerturbationsSystemes:
+    params = [[1, 4, 16], HORIZONS]
+    param_names = ['M', 't_max']
+
+    def setup(self, m, t_max):
+        import numpy as np
+        self.configurations = [tuple(c) for c in np.random.default_rng(0).uniform(-5, 5, (m, 4))]
+
+    def time_perturbations_systemes(self, m, t_max):
+        perturbation.perturbations_systemes.__wrapped__(self.configurations, 1e-3, t_max, 0.05, 2000)
+
+    def time_calcul_perturbation_boucle(self, m, t_max):
+        for a1, a2, x0, y0 in self.configurations:
+            perturbation.calcul_perturbation.__wrapped__(a1, a2, x0, y0, 1e-3, t_max, 0.05, 'exacte', 2000)
+
+
+class TimeDensiteTrajectoires:
+    params = [COEFFICIENTS, [16, 32, 64], [100, 200, 400]]
+    param_names = ['(a1, a2)', 'trajectoires par axe', 'pixels par axe']
+
+    def time_densite_trajectoires(self, coefficients, n, pixels):
+        a1, a2 = coefficients
+        rasterisation.densite_trajectoires.__wrapped__(a1, a2, (-5, 5), (-5, 5), n, (pixels, pixels))
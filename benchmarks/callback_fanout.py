@@ -0,0 +1,129 @@
+"""
+Nombre d'appels de callbacks déclenchés par une interaction de l'utilisateur
+
+Le graphe des callbacks est lu dans /_dash-dependencies. Un changement de
+propriété déclenche les callbacks qui l'ont en entrée, puis, de proche en
+proche, ceux qui dépendent de leurs sorties ; comme dans le navigateur,
+chaque callback n'est appelé qu'une fois par changement et ne se
+redéclenche pas sur ses propres sorties.
+
+Le nombre de changements envoyés par une interaction dépend du layout :
+un slider en updatemode='drag' en envoie un par cran, un dcc.Input sans
+debounce un par frappe.
+
+Usage : python -m benchmarks.callback_fanout [--json fichier]
+"""
+import argparse
+import json
+
+import benchmarks.common  # noqa: F401 (src/ dans sys.path)
+
+# (description, id du composant, nombre de crans parcourus ou texte tapé)
+INTERACTIONS = [
+    ('glisser a1 sur 20 crans', 'a1-slider', 20),
+    ('glisser x0 sur 20 crans', 'x0-slider', 20),
+    ('glisser t_max sur 10 crans', 'tmax-slider', 10),
+    ('taper "-2.5" dans a1', 'a1-input', '-2.5'),
+    ('taper "3" dans y0', 'y0-input', '3'),
+    ('choisir un scénario', 'scenario-dropdown', 1),
+]
+
+
+def _parameters_sync(prop):
+    """Props réécrites par parameters.sync (no_update pour les autres sorties)"""
+    name, kind = prop.split('.')[0].rsplit('-', 1)
+    if name == 'scenario':
+        return {f'{p}-{k}.value' for p in ('a1', 'a2') for k in ('slider', 'input')}
+    return {f"{name}-{'input' if kind == 'slider' else 'slider'}.value"}
+
+
+# callbacks du navigateur qui n'écrivent qu'une partie de leurs sorties
+# (fonction : prop déclencheuse -> props écrites) ; les autres écrivent tout
+PARTIAL_OUTPUTS = {('parameters', 'sync'): _parameters_sync}
+
+
+def _components(layout):
+    """id -> composant, sur tout l'arbre du layout"""
+    found, stack = {}, [layout]
+    while stack:
+        component = stack.pop()
+        if isinstance(component, (list, tuple)):
+            stack.extend(component)
+            continue
+        if getattr(component, 'id', None) is not None:
+            found[component.id] = component
+        children = getattr(component, 'children', None)
+        if children is not None and not isinstance(children, str):
+            stack.append(children)
+    return found
+
+
+def _props(spec):
+    return [f"{part.rsplit('.', 1)[0]}.{part.rsplit('.', 1)[1].split('@')[0]}"
+            for part in spec.strip('.').split('...')]
+
+
+def events(component, amount):
+    """Nombre de changements de valeur envoyés pour une interaction"""
+    if isinstance(amount, str):  # frappe au clavier dans un dcc.Input
+        return 1 if getattr(component, 'debounce', False) else len(amount)
+    if getattr(component, 'updatemode', 'mouseup') == 'drag':
+        return amount
+    return 1
+
+
+def fired(dependencies, prop):
+    """Callbacks appelés (serveur, navigateur) après un changement de prop"""
+    callbacks = []
+    for dep in dependencies:
+        clientside = dep.get('clientside_function')
+        partial = PARTIAL_OUTPUTS.get((clientside['namespace'], clientside['function_name'])) if clientside else None
+        callbacks.append((set(f"{i['id']}.{i['property']}" for i in dep['inputs']),
+                          _props(dep['output']), partial, bool(clientside)))
+
+    changed, done = {prop}, set()
+    progress = True
+    while progress:
+        progress = False
+        for index, (inputs, outputs, partial, _) in enumerate(callbacks):
+            triggers = inputs & changed
+            if index not in done and triggers:
+                done.add(index)
+                changed.update(partial(next(iter(triggers))) if partial else outputs)
+                progress = True
+    server = sum(1 for index in done if not callbacks[index][3])
+    return server, len(done) - server
+
+
+def measure():
+    import main
+
+    client = main.app.server.test_client()
+    dependencies = json.loads(client.get('/_dash-dependencies').data)
+    components = _components(main.app.layout)
+
+    results = []
+    for label, component_id, amount in INTERACTIONS:
+        n = events(components[component_id], amount)
+        server, clientside = fired(dependencies, f'{component_id}.value')
+        results.append({'interaction': label, 'events': n,
+                        'server_calls': n * server, 'clientside_calls': n * clientside})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--json', help='fichier où écrire les résultats')
+    args = parser.parse_args(argv)
+
+    results = measure()
+    print(f'{"interaction":<30} {"envois":>7} {"serveur":>8} {"navigateur":>11}')
+    for r in results:
+        print(f'{r["interaction"]:<30} {r["events"]:>7} {r["server_calls"]:>8} {r["clientside_calls"]:>11}')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""
+Outils communs aux benchmarks : accès au code de src/ et grille de paramètres.
+"""
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# Grille de paramètres : un système stable (foyer), un col instable et un
+# centre ; conditions initiales proche et loin de l'équilibre.
+COEFFICIENTS = [(-1.0, -0.5), (2.0, 1.0), (-4.0, 0.0)]
+INITIAL_CONDITIONS = [(1.0, 0.0), (4.0, -3.0)]
+TIME_STEPS = [0.05, 0.01]
+HORIZONS = [10.0, 100.0]
+
+
+def payload_bytes(result):
+    """Taille en octets de la réponse telle que Dash la sérialise"""
+    from plotly.io.json import to_json_plotly
+    return len(to_json_plotly(result).encode('utf-8'))
@@ -0,0 +1,78 @@
+"""
+Taille et temps de sérialisation des réponses des callbacks de figures
+
+Chaque callback est appelé comme une fonction, puis sa réponse est
+sérialisée comme le fait Dash (to_json_plotly), avec les tableaux typés en
+float64 puis réduits en float32 (transport.FLOAT32).
+
+Usage : python -m benchmarks.payload [--repeat 20] [--json fichier]
+"""
+import argparse
+import json
+import time
+
+import benchmarks.common  # noqa: F401 (src/ dans sys.path)
+
+PINNED = ['-1,-0.5,1,0', '0.5,0.2,-1,2', '-2,0,0.3,0.1', '-3,-1,2,2']
+
+# (description, callback de main, arguments)
+CASES = [
+    ('stabilité t_max=10', 'update_stability_trajectory', (-1.0, -0.5, 1.0, 0.0, 10.0)),
+    ('stabilité t_max=100', 'update_stability_trajectory', (-1.0, -0.5, 1.0, 0.0, 100.0)),
+    ('portrait de phase', 'update_phase_portrait', (-1.0, -0.5)),
+    ('scénario navire', 'update_scenario_visualization', ('ship', -1.5, -0.5, 1.0, 0.0, False)),
+    ('scénario porte', 'update_scenario_visualization', ('door', -1.5, -1.0, 1.0, 0.0, False)),
+    ('épinglées (stabilité)', 'update_stability_overlays', (PINNED, 100.0)),
+    ('épinglées (phase)', 'update_phase_overlays', (PINNED,)),
+]
+
+
+def measure(repeat):
+    import main
+    import transport
+    from plotly.io.json import to_json_plotly
+
+    results = []
+    for label, name, args in CASES:
+        row = {'callback': label}
+        for float32 in (False, True):
+            transport.FLOAT32 = float32
+            callback = getattr(main, name)
+            # calculs en cache : seul l'encodage des tableaux est mesuré dans le callback
+            response = callback(*args)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                response = callback(*args)
+            build = (time.perf_counter() - start) / repeat
+            start = time.perf_counter()
+            for _ in range(repeat):
+                payload = to_json_plotly(response)
+            serialize = (time.perf_counter() - start) / repeat
+            suffix = 'f4' if float32 else 'f8'
+            row[f'bytes_{suffix}'] = len(payload.encode('utf-8'))
+            row[f'callback_ms_{suffix}'] = 1000 * build
+            row[f'serialize_ms_{suffix}'] = 1000 * serialize
+        results.append(row)
+    transport.FLOAT32 = True
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20, help='appels mesurés par callback')
+    parser.add_argument('--json', help='fichier où écrire les résultats')
+    args = parser.parse_args(argv)
+
+    results = measure(args.repeat)
+    print(f'{"callback":<24} {"octets f8":>10} {"octets f4":>10} {"callback ms":>15} {"sérialisation ms":>18}')
+    for r in results:
+        print(f'{r["callback"]:<24} {r["bytes_f8"]:>10} {r["bytes_f4"]:>10}'
+              f' {r["callback_ms_f8"]:>7.2f}/{r["callback_ms_f4"]:<7.2f}'
+              f' {r["serialize_ms_f8"]:>9.2f}/{r["serialize_ms_f4"]:<8.2f}')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Exécute les benchmarks sans dépendance externe.
+
+Les fichiers bench_*.py suivent les conventions d'asv (params, param_names,
+setup, time_*, track_*), ce script les découvre et les exécute :
+
+    python -m benchmarks.run                   # tout
+    python -m benchmarks.run -k Perturbation   # filtre sur le nom
+    python -m benchmarks.run --json out.json   # résultats en JSON
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import timeit
+
+import benchmarks.common  # noqa: F401  (ajoute src/ au chemin)
+
+MODULES = sorted(
+    f[:-3] for f in os.listdir(os.path.dirname(os.path.abspath(__file__)))
+    if f.startswith('bench_') and f.endswith('.py')
+)
+
+
+def _combinations(cls):
+    params = getattr(cls, 'params', [])
+    if not params:
+        return [()]
+    if not isinstance(params[0], list):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def _time(fn, repeat=3):
+    # meilleur temps moyen par appel sur `repeat` séries (comme timeit)
+    fn()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(pattern=''):
+    results = []
+    for module_name in MODULES:
+        module = importlib.import_module(f'benchmarks.{module_name}')
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [m for m in dir(cls) if m.startswith(('time_', 'track_'))]
+            for method in methods:
+                name = f'{module_name}.{cls_name}.{method}'
+                if pattern not in name:
+                    continue
+                for combo in _combinations(cls):
+                    bench = cls()
+                    if hasattr(bench, 'setup'):
+                        bench.setup(*combo)
+                    fn = getattr(bench, method)
+                    if method.startswith('time_'):
+                        value, unit = _time(lambda: fn(*combo)), 's'
+                    else:
+                        value, unit = fn(*combo), getattr(fn, 'unit', '')
+                    results.append({'name': name, 'params': [repr(p) for p in combo],
+                                    'value': value, 'unit': unit})
+                    print(f'{name:<75} {", ".join(map(repr, combo)):<45} {_format(value, unit)}')
+    return results
+
+
+def _format(value, unit):
+    if unit == 's':
+        return f'{value * 1e3:10.3f} ms'
+    return f'{value:10} {unit}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='pattern', default='', help='ne lancer que les benchmarks dont le nom contient ce motif')
+    parser.add_argument('--json', help='fichier où écrire les résultats')
+    args = parser.parse_args()
+
+    results = run(args.pattern)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,83 @@
+"""
+Temps de démarrage du dashboard (démarrage à froid d'un conteneur)
+
+Dans un processus Python neuf :
+- temps jusqu'à la première réponse : import de main, puis GET / et
+  /_dash-layout, puis les callbacks de figures de la page d'accueil ;
+- répartition des imports avec `python -X importtime -c "import main"`,
+  regroupés par paquet de premier niveau (temps cumulé).
+
+Usage : python -m benchmarks.startup [--top 15] [--repeat 3]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+from benchmarks.common import SRC
+
+# exécuté dans un processus neuf (cwd = src/) : affiche les étapes en secondes
+FIRST_RESPONSE = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+client = main.app.server.test_client()
+client.get('/')
+client.get('/_dash-layout')
+served = time.perf_counter()
+main.update_stability_trajectory(0, 0, 1.0, 0.0)
+main.update_phase_portrait(0, 0)
+main.update_scenario_visualization('none', 0, 0, 1.0, 0.0, False)
+done = time.perf_counter()
+print(imported - start, served - start, done - start)
+"""
+
+
+def first_response(repeat):
+    """Médianes (import, première page, premières figures) en secondes"""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', FIRST_RESPONSE], cwd=SRC,
+                             capture_output=True, text=True, check=True).stdout
+        runs.append([float(v) for v in out.split()[-3:]])
+    return [statistics.median(column) for column in zip(*runs)]
+
+
+def import_breakdown():
+    """Temps cumulé (s) par paquet importé directement par main, d'après -X importtime"""
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=SRC,
+                         capture_output=True, text=True, check=True).stderr
+    totals = {}
+    for line in err.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # deux espaces d'indentation par niveau d'import imbriqué ; le niveau 1
+        # regroupe les imports faits par main (et par ses propres modules)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            package = name.strip().split('.')[0]
+            totals[package] = totals.get(package, 0.0) + int(cumulative) / 1e6
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--top', type=int, default=15, help='nombre de paquets affichés')
+    parser.add_argument('--repeat', type=int, default=3, help='nombre de démarrages mesurés')
+    args = parser.parse_args(argv)
+
+    imported, served, done = first_response(args.repeat)
+    print(f'import de main          {1000 * imported:8.0f} ms')
+    print(f'première page servie    {1000 * served:8.0f} ms')
+    print(f'premières figures       {1000 * done:8.0f} ms')
+
+    print('\nimports (temps cumulé, -X importtime)')
+    totals = import_breakdown()
+    for package, seconds in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'  {package:<28} {1000 * seconds:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Débit des callbacks de figures servis par gunicorn (requêtes par seconde)
+
+Pour chaque nombre de workers demandé, lance gunicorn (src/gunicorn.conf.py,
+wsgi:server), puis des clients concurrents envoient pendant une durée fixe
+des requêtes /_dash-update-component aux callbacks de figures (stabilité,
+portrait de phase, scénario, densité, configurations épinglées), avec des
+paramètres tirés au hasard sur la grille des sliders.
+
+Usage : python -m benchmarks.throughput [--workers 1 4 8] [--threads 4]
+        [--clients 16] [--duration 20]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import SRC
+
+FIGURE_OUTPUTS = ('stability-trajectory.figure', 'phase-portrait.figure', 'scenario-animation.figure')
+
+
+def _grid(low, high, step):
+    return [round(low + i * step, 1) for i in range(int(round((high - low) / step)) + 1)]
+
+
+PINNED = ['-1,-0.5,1,0', '0.5,0.2,-1,2', '-2,0,0.3,0.1', '-3,-1,2,2']
+
+# valeurs possibles de chaque entrée (mêmes pas que les sliders de main.py)
+INPUT_VALUES = {
+    'a1-slider': _grid(-5, 5, 0.1),
+    'a2-slider': _grid(-5, 5, 0.1),
+    'x0-slider': _grid(-5, 5, 0.1),
+    'y0-slider': _grid(-5, 5, 0.1),
+    'tmax-slider': [10, 50, 100],
+    'scenario-dropdown': ['ship', 'door'],
+    'scenario-client-mode': [False],
+    'phase-density': [False, True],
+    # valeur du Dropdown multiple : clés 'a1,a2,x0,y0' (pin_configuration)
+    'pinned-configs': [[], PINNED[:1], PINNED[:2], PINNED],
+}
+
+
+def figure_callbacks(dependencies):
+    """Callbacks serveur dont une des sorties est une figure"""
+    return [dep for dep in dependencies
+            if not dep.get('clientside_function')
+            and any(output in dep['output'] for output in FIGURE_OUTPUTS)]
+
+
+def request_body(dep, rng):
+    """Corps d'une requête /_dash-update-component avec des entrées au hasard"""
+    outputs = [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1].split('@')[0]}
+               for part in dep['output'].strip('.').split('...')]
+    inputs = [dict(item, value=rng.choice(INPUT_VALUES[item['id']])) for item in dep['inputs']]
+    state = [dict(item, value=rng.choice(INPUT_VALUES[item['id']])) for item in dep['state']]
+    return {
+        'output': dep['output'],
+        'outputs': outputs if dep['output'].startswith('..') else outputs[0],
+        'inputs': inputs,
+        'state': state,
+        'changedPropIds': [f"{inputs[0]['id']}.{inputs[0]['property']}"],
+    }
+
+
+def check_inputs(callbacks):
+    """Échoue avant le lancement des clients si une entrée n'a pas de valeurs dans INPUT_VALUES"""
+    unknown = sorted({item['id'] for dep in callbacks for item in dep['inputs'] + dep['state']}
+                     - INPUT_VALUES.keys())
+    if unknown:
+        raise RuntimeError(f'entrées sans valeurs dans INPUT_VALUES : {", ".join(unknown)}')
+
+
+def wait_ready(host, port, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request('GET', '/_dash-dependencies')
+            response = conn.getresponse()
+            if response.status == 200:
+                return json.loads(response.read())
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'gunicorn ne répond pas sur {host}:{port}')
+
+
+def client(host, port, callbacks, seed, stop, results):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    while not stop.is_set():
+        dep = rng.choice(callbacks)
+        body = json.dumps(request_body(dep, rng))
+        start = time.perf_counter()
+        try:
+            conn.request('POST', '/_dash-update-component', body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except OSError:
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            ok = False
+        if not stop.is_set():
+            results.append((dep['output'], time.perf_counter() - start, ok))
+    conn.close()
+
+
+def run(workers, threads, clients, duration, port, host='127.0.0.1'):
+    env = dict(os.environ, MODSIM_WORKERS=str(workers), MODSIM_THREADS=str(threads),
+               MODSIM_BIND=f'{host}:{port}')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:server'],
+                              cwd=SRC, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        callbacks = figure_callbacks(wait_ready(host, port))
+        if not callbacks:
+            raise RuntimeError('aucun callback de figure trouvé dans /_dash-dependencies')
+        check_inputs(callbacks)
+        results, stop = [], threading.Event()
+        pool = [threading.Thread(target=client, args=(host, port, callbacks, seed, stop, results))
+                for seed in range(clients)]
+        for thread in pool:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in pool:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for _, latency, ok in results if ok)
+    return {
+        'workers': workers,
+        'threads': threads,
+        'requests': len(results),
+        'errors': sum(1 for *_, ok in results if not ok),
+        'rps': len(latencies) / duration,
+        'p50_ms': 1000 * statistics.median(latencies) if latencies else None,
+        'p95_ms': 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--clients', type=int, default=16, help='clients HTTP concurrents')
+    parser.add_argument('--duration', type=float, default=20.0, help='durée de chaque mesure (s)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--json', help='fichier où écrire les résultats')
+    args = parser.parse_args(argv)
+
+    print(f'{"workers":>8} {"threads":>8} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"erreurs":>8}')
+    profile = []
+    for workers in args.workers:
+        result = run(workers, args.threads, args.clients, args.duration, args.port)
+        profile.append(result)
+        print(f'{workers:>8} {args.threads:>8} {result["rps"]:>8.1f} {result["p50_ms"] or 0:>8.1f} '
+              f'{result["p95_ms"] or 0:>8.1f} {result["errors"]:>8}')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(profile, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+/* Synchronisation des paramètres a1, a2, x0, y0 (slider <-> champ numérique)
+ *
+ * Un seul callback, exécuté dans le navigateur : la valeur modifiée est
+ * bornée, arrondie et recopiée dans son double ; un scénario prédéfini fixe
+ * a1 et a2. Seules les valeurs qui changent réellement sont réécrites, de
+ * sorte que les callbacks de figures (branchés sur les sliders) ne partent
+ * qu'une fois par changement.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    parameters: {
+        // config : {range, presets, defaults} (store 'parameter-config')
+        sync: function(a1s, a1i, a2s, a2i, x0s, x0i, y0s, y0i, scenario, config) {
+            const no_update = window.dash_clientside.no_update;
+            const triggered = window.dash_clientside.callback_context.triggered;
+            const names = ['a1', 'a2', 'x0', 'y0'];
+            const sliders = [a1s, a2s, x0s, y0s];
+            const inputs = [a1i, a2i, x0i, y0i];
+            // sorties : les 4 sliders puis les 4 champs
+            const out = [no_update, no_update, no_update, no_update,
+                         no_update, no_update, no_update, no_update];
+            if (!triggered || !triggered.length) {
+                return out;
+            }
+
+            function clean(value, k) {
+                let v = parseFloat(value);
+                if (!isFinite(v)) {
+                    v = config.defaults[k];
+                }
+                v = Math.min(config.range[1], Math.max(config.range[0], v));
+                return Math.round(v * 1000) / 1000;
+            }
+
+            function set(k, v) {
+                if (v !== sliders[k]) {
+                    out[k] = v;
+                }
+                if (v !== inputs[k]) {
+                    out[4 + k] = v;
+                }
+            }
+
+            const trigger = triggered[0].prop_id.split('.')[0];
+            if (trigger === 'scenario-dropdown') {
+                const preset = config.presets[scenario];
+                if (preset) {
+                    set(0, preset[0]);
+                    set(1, preset[1]);
+                }
+                return out;
+            }
+
+            const k = names.indexOf(trigger.split('-')[0]);
+            if (k >= 0) {
+                set(k, clean(trigger.endsWith('-slider') ? sliders[k] : inputs[k], k));
+            }
+            return out;
+        }
+    }
+});
@@ -0,0 +1,219 @@
+/* Moteur du quiz exécuté dans le navigateur
+ *
+ * Les énoncés de la session sont envoyés une seule fois, au lancement du
+ * quiz, dans le store 'quiz-bank' ; les réponses attendues restent sur le
+ * serveur. Ouverture, timeout de 7 s et navigation sont gérés ici. Chaque
+ * réponse part au serveur (callback submit_quiz_answer), qui l'enregistre
+ * dans la session et renvoie le verdict de la question ('quiz-verdict').
+ * Le délai de 7 s est aussi vérifié par le serveur : une réponse arrivée
+ * trop tard y est enregistrée comme un temps écoulé.
+ */
+(function() {
+    // Ordre des sorties de la callback (voir register_quiz_callbacks)
+    const OUTPUTS = [
+        'is_open', 'state', 'question_text', 'question_number',
+        'audio_key', 'audio_autoplay', 'audio_src',
+        'timer_style', 'timer_class', 'einstein_class',
+        'explanation_style', 'expl_title', 'expl_title_style',
+        'expl_answer_style', 'expl_answer_value', 'expl_answer_value_style', 'expl_text',
+        'btn_true_disabled', 'btn_false_disabled', 'next_style', 'finish_style',
+        'answer_audio_src', 'answer_audio_key', 'answer_audio_autoplay',
+        'interval_disabled', 'interval_n'
+    ];
+
+    const TIMER_RUNNING = {
+        height: '6px',
+        backgroundColor: '#28a745',
+        marginTop: '10px',
+        borderRadius: '3px',
+        width: '100%',
+        animation: 'timer-countdown 7s linear forwards'
+    };
+    const TIMER_STOPPED = {height: '6px', width: '0%', animation: 'none'};
+    const HIDDEN = {display: 'none'};
+    const VISIBLE = {display: 'inline-block'};
+    const GREEN = '#28a745';
+    const RED = '#dc3545';
+
+    function result(updates) {
+        const no_update = window.dash_clientside.no_update;
+        return OUTPUTS.map(function(key) {
+            return key in updates ? updates[key] : no_update;
+        });
+    }
+
+    function explanationStyle(background, border) {
+        return {
+            display: 'block',
+            padding: '20px',
+            borderRadius: '5px',
+            backgroundColor: background,
+            border: '1px solid ' + border,
+            marginTop: '20px'
+        };
+    }
+
+    // Bouton suivant ou finir selon la position dans le quiz
+    function navigation(state) {
+        const isLast = state.current_question === state.total - 1;
+        return {
+            next_style: isLast ? HIDDEN : VISIBLE,
+            finish_style: isLast ? VISIBLE : HIDDEN
+        };
+    }
+
+    function showQuestion(bank, state) {
+        const idx = state.current_question;
+        const now = Date.now();
+        return {
+            is_open: true,
+            state: state,
+            question_text: bank[idx].question,
+            question_number: 'Question ' + (idx + 1) + ' / ' + state.total,
+            audio_key: 'audio-q' + idx + '-' + now,  // nouvelle clé pour relancer l'audio
+            audio_autoplay: true,
+            audio_src: '/assets/tictacboum.mp3',
+            timer_style: TIMER_RUNNING,
+            timer_class: 'quiz-timer-bar reanimate-' + now,
+            einstein_class: 'einstein-inflating',
+            explanation_style: HIDDEN,
+            btn_true_disabled: false,
+            btn_false_disabled: false,
+            next_style: HIDDEN,
+            finish_style: HIDDEN,
+            interval_disabled: false,  // minuteur de 7 s
+            interval_n: 0
+        };
+    }
+
+    function closeModal(state) {
+        return {
+            is_open: false,
+            state: state,
+            question_text: '',
+            question_number: '',
+            audio_key: 'audio-closed',
+            audio_autoplay: false,
+            audio_src: '',
+            timer_style: TIMER_STOPPED,
+            timer_class: '',
+            einstein_class: '',
+            explanation_style: HIDDEN,
+            btn_true_disabled: false,
+            btn_false_disabled: false,
+            next_style: HIDDEN,
+            finish_style: HIDDEN,
+            interval_disabled: true,
+            interval_n: 0
+        };
+    }
+
+    // Réponse ou timeout : on fige la question en attendant le verdict du serveur
+    function pending(state) {
+        return {
+            state: Object.assign({}, state, {answered: true}),
+            btn_true_disabled: true,
+            btn_false_disabled: true,
+            audio_autoplay: false,  // arrêter le tic-tac
+            audio_src: '',
+            timer_class: '',
+            timer_style: {height: '6px', width: '0%', animation: 'none', backgroundColor: RED},
+            interval_disabled: true
+        };
+    }
+
+    function reveal(state, verdict) {
+        state = Object.assign({}, state, {revealed: true});
+        if (verdict.rejected) {
+            return Object.assign({
+                state: state,
+                explanation_style: explanationStyle('#e2e3e5', '#6c757d'),
+                expl_title: 'Réponse non enregistrée',
+                expl_title_style: {color: '#383d41', marginBottom: '15px'},
+                expl_answer_style: HIDDEN,
+                expl_text: 'La session a expiré ou le quiz est terminé : relancez le quiz.'
+            }, navigation(state));
+        }
+        if (verdict.correct === null) {
+            return Object.assign({
+                state: state,
+                explanation_style: explanationStyle('#fff3cd', '#ffc107'),
+                expl_title: 'Temps écoulé',
+                expl_title_style: {color: '#856404', marginBottom: '15px'},
+                expl_answer_style: {display: 'block'},
+                expl_answer_value: verdict.answer ? 'VRAI' : 'FAUX',
+                expl_answer_value_style: {color: verdict.answer ? GREEN : RED, margin: '10px 0'},
+                expl_text: verdict.explanation,
+                einstein_class: ''
+            }, navigation(state));
+        }
+        const correct = verdict.correct;
+        return Object.assign({
+            state: state,
+            explanation_style: explanationStyle(correct ? '#d4edda' : '#f8d7da', correct ? GREEN : RED),
+            expl_title: correct ? 'Correct' : 'Incorrect',
+            expl_title_style: {color: correct ? GREEN : RED, marginBottom: '15px'},
+            expl_answer_style: HIDDEN,
+            expl_text: verdict.explanation,
+            einstein_class: correct ? 'einstein-celebrate' : 'einstein-sad',
+            // audio de réponse limité à 3 secondes
+            answer_audio_src: correct ? '/assets/good_answer.mp3#t=0,3' : '/assets/bad_answer.mp3#t=0,3',
+            answer_audio_key: 'answer-' + Date.now(),
+            answer_audio_autoplay: true
+        }, navigation(state));
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        quiz: {
+            step: function(bank, close, next, finish, btnTrue, btnFalse, nIntervals, verdict, state) {
+                const triggered = window.dash_clientside.callback_context.triggered;
+                if (!triggered || !triggered.length || !bank) {
+                    return result({});
+                }
+                const trigger = triggered[0].prop_id.split('.')[0];
+
+                // Nouvelle session reçue du serveur
+                if (trigger === 'quiz-bank') {
+                    return result(showQuestion(bank, {
+                        current_question: 0,
+                        answered: false,
+                        revealed: false,
+                        total: bank.length
+                    }));
+                }
+                if (trigger === 'quiz-next-btn') {
+                    const nextIdx = state.current_question + 1;
+                    if (nextIdx >= state.total) {
+                        return result({});
+                    }
+                    return result(showQuestion(bank, Object.assign({}, state, {
+                        current_question: nextIdx,
+                        answered: false,
+                        revealed: false
+                    })));
+                }
+                if (trigger === 'close-quiz-modal' || trigger === 'quiz-finish-btn') {
+                    return result(closeModal(state));
+                }
+
+                // Verdict du serveur pour la question affichée, une seule fois
+                if (trigger === 'quiz-verdict') {
+                    if (!verdict || verdict.index !== state.current_question || state.revealed) {
+                        return result({});
+                    }
+                    return result(reveal(state, verdict));
+                }
+
+                // Réponse ou timeout : une seule fois par question
+                if (state.answered) {
+                    return result({});
+                }
+                if (trigger === 'quiz-btn-true' || trigger === 'quiz-btn-false' ||
+                        (trigger === 'quiz-interval' && nIntervals)) {
+                    return result(pending(state));
+                }
+                return result({});
+            }
+        }
+    });
+})();
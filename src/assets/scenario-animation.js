@@ -0,0 +1,40 @@
+/* Animation des scénarios calculée dans le navigateur
+ *
+ * Le serveur n'envoie que la série des angles x[k] et les formes au repos
+ * (store 'scenario-data'). À chaque tick de 'scenario-interval', chaque forme
+ * est tournée de l'angle courant et remplace la trace correspondante.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    scenario: {
+        // Démarre (ou relance depuis le début) l'animation
+        play: function(n_clicks) {
+            return [false, 0];
+        },
+
+        animate: function(n_intervals, data, figure) {
+            const no_update = window.dash_clientside.no_update;
+            if (!data || !figure || !data.angles.length) {
+                return [no_update, true];
+            }
+
+            const last = data.angles.length - 1;
+            const k = Math.min(n_intervals || 0, last);
+            const c = Math.cos(data.angles[k]);
+            const s = Math.sin(data.angles[k]);
+
+            const traces = figure.data.map(function(trace, i) {
+                const shape = data.shapes[i];
+                if (!shape) {
+                    return trace;
+                }
+                return Object.assign({}, trace, {
+                    x: shape.x.map(function(px, j) { return px * c - shape.y[j] * s; }),
+                    y: shape.x.map(function(px, j) { return px * s + shape.y[j] * c; })
+                });
+            });
+
+            // Arrêter l'intervalle une fois la dernière image affichée
+            return [Object.assign({}, figure, {data: traces}), k >= last];
+        }
+    }
+});
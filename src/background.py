@@ -0,0 +1,67 @@
+"""
+Callbacks lourds exécutés en arrière-plan (mode optionnel)
+
+Avec MODSIM_BACKGROUND_CALLBACKS=1, les callbacks déclarés avec
+background_callback tournent dans un processus séparé, géré par le
+DiskcacheManager de Dash, au lieu de bloquer le thread de la requête :
+- quand les entrées changent à nouveau (glissement d'un slider), Dash
+  termine le calcul en cours devenu obsolète avant de lancer le suivant ;
+- le callback publie son avancement avec set_progress ;
+- les entrées `cancel` annulent le calcul en cours.
+
+Sans la variable, ou si diskcache n'est pas installé (pip install
+"dash[diskcache]"), les mêmes callbacks restent synchrones.
+
+Chaque calcul part d'une copie (fork) du processus serveur et disparaît
+avec elle : ce qui est préparé avant le fork (figures des scénarios
+prédéfinis, voir warm_scenario_cache) est disponible, mais les caches de
+calcul (memoiser) remplis pendant un calcul sont perdus, et le calcul
+suivant pour les mêmes paramètres recommence.
+"""
+import os
+import tempfile
+import warnings
+
+# intervalle (ms) auquel le navigateur interroge le serveur pendant un calcul
+POLL_INTERVAL = 250
+
+
+def create_background_manager(cache_dir=None):
+    """DiskcacheManager si MODSIM_BACKGROUND_CALLBACKS est activé, sinon None"""
+    if os.environ.get('MODSIM_BACKGROUND_CALLBACKS', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+    try:
+        import diskcache
+    except ImportError:
+        warnings.warn('MODSIM_BACKGROUND_CALLBACKS ignoré : diskcache non installé '
+                      '(pip install "dash[diskcache]")')
+        return None
+    from dash import DiskcacheManager
+
+    # dossier partagé par les workers gunicorn : les résultats y sont déposés
+    cache_dir = cache_dir or os.environ.get(
+        'MODSIM_BACKGROUND_DIR', os.path.join(tempfile.gettempdir(), 'modsim-background'))
+    return DiskcacheManager(diskcache.Cache(cache_dir))
+
+
+def background_callback(app, manager, *dependencies, progress=None, cancel=None, running=None, **kwargs):
+    """
+    Comme app.callback, mais en arrière-plan si manager n'est pas None.
+
+    La fonction décorée reçoit set_progress en argument nommé (None en mode
+    synchrone) et reste appelable directement avec ses arguments habituels.
+    """
+    def decorator(func):
+        if manager is None:
+            app.callback(*dependencies, **kwargs)(func)
+            return func
+
+        # Dash passe set_progress en premier argument positionnel
+        def job(set_progress, *args):
+            return func(*args, set_progress=set_progress)
+        job.__name__ = func.__name__
+
+        app.callback(*dependencies, background=True, manager=manager, interval=POLL_INTERVAL,
+                     progress=progress, cancel=cancel, running=running, **kwargs)(job)
+        return func
+    return decorator
@@ -0,0 +1,180 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+import numpy as np
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "expirations", "maxsize", "currsize"])
+
+# valeur renvoyée par CacheLRU.get quand la clé est absente ou expirée
+ABSENT = object()
+
+# tous les caches créés par memoiser et memoiser_lot, par nom qualifié de fonction
+_CACHES: dict[str, "CacheLRU"] = {}
+
+
+class CacheLRU:
+    """
+    Cache LRU borné en taille, avec expiration (ttl en secondes) et statistiques.
+
+    Les accès sont protégés par un verrou : le cache est partagé entre les
+    threads du serveur.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._donnees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    def get(self, cle):
+        with self._verrou:
+            entree = self._donnees.get(cle)
+            if entree is None:
+                self.misses += 1
+                return ABSENT
+            expiration, valeur = entree
+            if expiration is not None and expiration < time.monotonic():
+                del self._donnees[cle]
+                self.expirations += 1
+                self.misses += 1
+                return ABSENT
+            self._donnees.move_to_end(cle)
+            self.hits += 1
+            return valeur
+
+    def set(self, cle, valeur):
+        expiration = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._verrou:
+            self._donnees[cle] = (expiration, valeur)
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self.maxsize:
+                self._donnees.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._verrou:
+            return CacheInfo(self.hits, self.misses, self.expirations, self.maxsize, len(self._donnees))
+
+    def clear(self):
+        with self._verrou:
+            self._donnees.clear()
+            self.hits = self.misses = self.expirations = 0
+
+
+def _normaliser(valeur, decimales: int | None):
+    # clé hashable ; les paramètres de sliders sont arrondis à leur précision
+    if decimales is not None and valeur is not None:
+        return round(float(valeur), decimales) + 0.0  # -0.0 et 0.0 donnent la même clé
+    if isinstance(valeur, (np.ndarray, list, tuple)):
+        tableau = np.asarray(valeur)
+        return (tableau.shape, tableau.dtype.str, tableau.tobytes())
+    return valeur
+
+
+def _lecture_seule(valeur):
+    # le même tableau est rendu à plusieurs appelants : on interdit de le modifier
+    if isinstance(valeur, np.ndarray):
+        valeur.setflags(write=False)
+    elif isinstance(valeur, (tuple, list)):
+        for element in valeur:
+            _lecture_seule(element)
+    elif isinstance(valeur, dict):
+        for element in valeur.values():
+            _lecture_seule(element)
+    return valeur
+
+
+def memoiser(maxsize: int = 128, ttl: float | None = 600.0,
+             quantifier: tuple[str, ...] = (), decimales: int = 3):
+    """
+    Décorateur de mise en cache des résultats d'une fonction de calcul.
+
+    Les arguments nommés dans `quantifier` sont arrondis à `decimales`
+    chiffres (précision des sliders) avant de former la clé et avant
+    d'appeler la fonction, les autres sont pris tels quels. Les tableaux retournés sont en lecture seule.
+    La fonction décorée expose cache_info() et cache_clear().
+    """
+    def decorateur(fonction):
+        signature = inspect.signature(fonction)
+        cache = CacheLRU(maxsize, ttl)
+        _CACHES[f"{fonction.__module__}.{fonction.__qualname__}"] = cache
+
+        @wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            # la fonction reçoit les valeurs arrondies : le résultat correspond
+            # à sa clé, quel que soit le premier appelant du même arrondi
+            for nom in quantifier:
+                arguments.arguments[nom] = _normaliser(arguments.arguments[nom], decimales)
+            cle = tuple(
+                _normaliser(valeur, None) if nom not in quantifier else valeur
+                for nom, valeur in arguments.arguments.items()
+            )
+            valeur = cache.get(cle)
+            if valeur is ABSENT:
+                valeur = _lecture_seule(fonction(*arguments.args, **arguments.kwargs))
+                cache.set(cle, valeur)
+            return valeur
+
+        enveloppe.cache = cache
+        enveloppe.cache_info = cache.info
+        enveloppe.cache_clear = cache.clear
+        return enveloppe
+    return decorateur
+
+
+def memoiser_lot(maxsize: int = 128, ttl: float | None = 600.0, decimales: int = 3):
+    """
+    Mise en cache élément par élément d'une fonction qui traite un lot.
+
+    La fonction décorée reçoit en premier argument une liste d'éléments
+    (tuples de paramètres, arrondis à `decimales` chiffres avant de former
+    la clé et avant l'appel) et retourne la liste des résultats dans le même
+    ordre. Seuls les éléments absents du cache lui sont passés, en un seul
+    appel ; les autres arguments font partie de la clé de chaque élément.
+    """
+    def decorateur(fonction):
+        signature = inspect.signature(fonction)
+        cache = CacheLRU(maxsize, ttl)
+        _CACHES[f"{fonction.__module__}.{fonction.__qualname__}"] = cache
+
+        @wraps(fonction)
+        def enveloppe(elements, *args, **kwargs):
+            arguments = signature.bind(elements, *args, **kwargs)
+            arguments.apply_defaults()
+            commun = tuple(_normaliser(valeur, None) for valeur in list(arguments.arguments.values())[1:])
+            # comme pour memoiser, la fonction reçoit les éléments arrondis
+            arrondis = [tuple(_normaliser(v, decimales) for v in element) for element in elements]
+            cles = [element + commun for element in arrondis]
+
+            resultats = [cache.get(cle) for cle in cles]
+            manquants = [i for i, valeur in enumerate(resultats) if valeur is ABSENT]
+            if manquants:
+                calcules = fonction([arrondis[i] for i in manquants], *args, **kwargs)
+                for i, valeur in zip(manquants, calcules):
+                    resultats[i] = _lecture_seule(valeur)
+                    cache.set(cles[i], resultats[i])
+            return resultats
+
+        enveloppe.cache = cache
+        enveloppe.cache_info = cache.info
+        enveloppe.cache_clear = cache.clear
+        return enveloppe
+    return decorateur
+
+
+def statistiques_caches() -> dict[str, CacheInfo]:
+    """Retourne les statistiques de tous les caches de calcul."""
+    return {nom: cache.info() for nom, cache in _CACHES.items()}
+
+
+def vider_caches():
+    """Vide tous les caches de calcul (utile pour mesurer un calcul à froid)."""
+    for cache in _CACHES.values():
+        cache.clear()
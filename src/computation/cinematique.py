@@ -0,0 +1,21 @@
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+# fonction pour tourner une forme de tous les angles d'une simulation à la fois
+def tourner_forme(angles: ArrayLike, forme: ArrayLike) -> NDArray:
+    """
+    Applique la rotation d'angle angles[k] (autour de l'origine) à chaque
+    point d'un polygone forme de taille (P, 2).
+
+    Retourne un tableau (T, P, 2) : positions[k] est la forme à l'instant k.
+    """
+    angles = np.asarray(angles, dtype=float)
+    forme = np.asarray(forme, dtype=float)
+    c = np.cos(angles)[:, None]
+    s = np.sin(angles)[:, None]
+
+    positions = np.empty((len(angles), len(forme), 2))
+    positions[..., 0] = forme[:, 0]*c - forme[:, 1]*s
+    positions[..., 1] = forme[:, 0]*s + forme[:, 1]*c
+    return positions
@@ -1,5 +1,7 @@
 import numpy as np
-from scipy.integrate import odeint
+
+from computation.cache import memoiser, memoiser_lot
+from computation.propagateur import exponentielle, matrice_systeme, propager, propager_systemes
 
 def systeme(state, t, a1: float, a2: float):
     x, y = state
@@ -8,23 +10,207 @@ def systeme(state, t, a1: float, a2: float):
     return [dx, dy]
 
 
+def decimer_minmax(series: np.ndarray, points_max: int) -> np.ndarray:
+    """
+    Choisit au plus ~points_max indices qui gardent l'allure des courbes.
+
+    series est un tableau (k, n) de courbes partageant le même axe t. L'axe
+    est découpé en seaux ; dans chaque seau on garde, pour chaque courbe,
+    l'indice du minimum et du maximum (les pics restent visibles à l'écran).
+    """
+    k, n = series.shape
+    n_seaux = max(1, (points_max - 2) // (2*k))
+    taille = -(-n // n_seaux)
+
+    # on complète le dernier seau en répétant la dernière valeur
+    seaux = np.pad(series, ((0, 0), (0, n_seaux*taille - n)), mode='edge')
+    seaux = seaux.reshape(k, n_seaux, taille)
+    debut = np.arange(n_seaux) * taille
+    indices = np.concatenate([
+        [0, n - 1],
+        (seaux.argmin(axis=2) + debut).ravel(),
+        (seaux.argmax(axis=2) + debut).ravel(),
+    ])
+    return np.unique(np.clip(indices, 0, n - 1))
+
+
+@memoiser(maxsize=256, quantifier=("a1", "a2", "x0", "y0"))
 def calcul_perturbation(a1: float, a2: float,
                         x0: float, y0: float,
                         eps: float = 1e-3,
                         t_max: float = 10.0,
-                        dt: float = 0.05):
+                        dt: float = 0.05,
+                        methode: str = "odeint",
+                        points_max: int | None = None):
     """
     Calcule la distance entre une trajectoire et une perturbée de valeur eps
+
+    methode : "odeint" (intégration numérique de systeme), "exacte"
+    (propagateur exp(A*t) en forme fermée, sans appel Python par pas) ou
+    "adaptative" (RK45 à pas contrôlé par l'erreur, évalué sur la grille
+    par sortie dense)
+    points_max : si donné, les séries sont décimées (min/max par seau) à
+    environ ce nombre de points, pour les longs horizons
     """
     t = np.arange(0, t_max + dt, dt)
 
-    sol = odeint(systeme, [x0, y0], t, args=(a1, a2))
-    x = sol[:, 0]
-    y = sol[:, 1]
+    if methode == "exacte":
+        etats = propager(a1, a2, [[x0, y0], [x0 + eps, y0 + eps]], t)
+        x, y = etats[0, :, 0], etats[0, :, 1]
+        x_p, y_p = etats[1, :, 0], etats[1, :, 1]
+    elif methode == "adaptative":
+        # import de scipy.integrate (~0.3 s) seulement si une méthode numérique est demandée
+        from scipy.integrate import solve_ivp
+
+        # les deux trajectoires sont intégrées ensemble : z = (x, y, x_p, y_p)
+        A = matrice_systeme(a1, a2)
+        A2 = np.kron(np.eye(2), A)
+        sol = solve_ivp(lambda _, z: A2 @ z, (0, t[-1]), [x0, y0, x0 + eps, y0 + eps],
+                        method='RK45', rtol=1e-8, atol=1e-10, dense_output=True,
+                        vectorized=True)
+        x, y, x_p, y_p = sol.sol(t)
+    elif methode == "odeint":
+        from scipy.integrate import odeint
+
+        sol = odeint(systeme, [x0, y0], t, args=(a1, a2))
+        x = sol[:, 0]
+        y = sol[:, 1]
+
+        solp = odeint(systeme, [x0 + eps, y0 + eps], t, args=(a1, a2))
+        x_p = solp[:, 0]
+        y_p = solp[:, 1]
+    else:
+        raise ValueError(f"Méthode d'intégration inconnue : {methode}")
 
-    solp = odeint(systeme, [x0 + eps, y0 + eps], t, args=(a1, a2))
-    x_p = solp[:, 0]
-    y_p = solp[:, 1]
     dist = np.sqrt((x - x_p)**2 + (y - y_p)**2)
 
+    if points_max is not None and len(t) > points_max:
+        garder = decimer_minmax(np.vstack([x, y, x_p, y_p, dist]), points_max)
+        t, x, y, x_p, y_p, dist = (s[garder] for s in (t, x, y, x_p, y_p, dist))
+
     return t, x, y, x_p, y_p, dist
+
+
+@memoiser_lot(maxsize=64)
+def perturbations_systemes(configurations: list[tuple[float, float, float, float]],
+                           eps: float = 1e-3,
+                           t_max: float = 10.0,
+                           dt: float = 0.05,
+                           points_max: int | None = None) -> list[tuple]:
+    """
+    Comme calcul_perturbation (méthode "exacte") pour M configurations
+    (a1, a2, x0, y0) à la fois : les M systèmes sont propagés en un seul appel.
+
+    Retourne, pour chaque configuration, (t, x, y, x_p, y_p, dist). Le cache
+    est par configuration : seules les configurations nouvelles sont calculées.
+    """
+    t = np.arange(0, t_max + dt, dt)
+    a1, a2, x0, y0 = np.asarray(configurations, dtype=float).reshape(-1, 4).T
+    etats0 = np.stack([np.column_stack([x0, y0]), np.column_stack([x0 + eps, y0 + eps])], axis=1)
+    etats = propager_systemes(a1, a2, etats0, t)                     # (M, 2, T, 2)
+
+    resultats = []
+    for nominal, perturbe in etats:
+        x, y = nominal[:, 0], nominal[:, 1]
+        x_p, y_p = perturbe[:, 0], perturbe[:, 1]
+        dist = np.sqrt((x - x_p)**2 + (y - y_p)**2)
+        series = (t, x, y, x_p, y_p, dist)
+        if points_max is not None and len(t) > points_max:
+            garder = decimer_minmax(np.vstack(series[1:]), points_max)
+            series = tuple(s[garder] for s in series)
+        resultats.append(series)
+    return resultats
+
+
+@memoiser(maxsize=64, quantifier=("a1", "a2"))
+def ensemble_perturbation(a1: float, a2: float,
+                          eps: float = 1e-3,
+                          n: int = 1000,
+                          t_max: float = 10.0,
+                          dt: float = 0.05,
+                          directions: str = "aleatoire",
+                          percentiles: tuple[float, ...] = (5.0, 50.0, 95.0),
+                          graine: int = 0,
+                          classes: int = 256,
+                          taille_bloc: int = 1 << 18,
+                          points_max: int | None = None):
+    """
+    Distance ||Δ||(t) pour n perturbations de norme eps autour d'un même état.
+
+    Le système étant linéaire, Δ(t) = exp(A*t) Δ(0) ne dépend pas de (x0, y0) :
+    on applique le propagateur exact à toutes les directions, par blocs d'au
+    plus taille_bloc valeurs (n * len(t) peut dépasser la mémoire). Chaque
+    bloc alimente, pour chaque instant, un histogramme de log10 ||Δ|| entre
+    eps*σ_min(t) et eps*σ_max(t), les valeurs singulières de exp(A*t) qui
+    bornent toutes les distances possibles ; les percentiles en sont lus à
+    (log10 σ_max - log10 σ_min) / classes près.
+
+    directions : "aleatoire" (angles tirés uniformément, graine fixée) ou
+    "structurees" (angles régulièrement espacés sur un demi-cercle, ||Δ||
+    étant la même pour Δ(0) et -Δ(0))
+    Retourne (t, bandes, taux) : bandes a la forme (len(percentiles), len(t))
+    et taux est le taux de croissance moyen à t_max, moyenne sur l'ensemble
+    de log(||Δ(t_max)|| / eps) / t_max (> 0 : les perturbations s'amplifient).
+    """
+    t = np.arange(0, t_max + dt, dt)
+    phi = exponentielle(a1, a2, t)
+
+    if directions == "aleatoire":
+        angles = np.random.default_rng(graine).uniform(0, 2*np.pi, n)
+    elif directions == "structurees":
+        angles = np.linspace(0, np.pi, n, endpoint=False)
+    else:
+        raise ValueError(f"Directions inconnues : {directions}")
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        # Φ ramenée à des coefficients d'ordre 1 (échelle 10**echelle) : ||Φ||_F² déborderait dès σ_max ~ 1e154
+        maximum = np.abs(phi).max(axis=(1, 2))
+        q = phi / maximum[:, None, None]
+        echelle = np.log10(eps) + np.log10(maximum)
+
+        # valeurs singulières d'une matrice 2x2 : σ_max² + σ_min² = ||Φ||_F², σ_max σ_min = |det Φ|
+        frobenius = (q**2).sum(axis=(1, 2))
+        det = np.abs(q[:, 0, 0]*q[:, 1, 1] - q[:, 0, 1]*q[:, 1, 0])
+        ecart = np.sqrt(np.maximum(frobenius**2 - 4*det**2, 0))
+        haut = echelle + 0.5*np.log10((frobenius + ecart) / 2)
+        # σ_min = |det| / σ_max : (frobenius - ecart) / 2 s'annule par cancellation dès que σ_min << σ_max
+        # en deçà de σ_max * 1e-16 les distances calculées ne sont que de l'arrondi ;
+        # ce plancher couvre aussi det == 0 (log10 = -inf)
+        bas = echelle + np.log10(det) - 0.5*np.log10((frobenius + ecart) / 2)
+        bas = np.maximum(bas, haut - 16)
+        largeur = np.where(haut > bas, haut - bas, 1.0)
+
+        # ||Φ(t) u||² = u^T G(t) u avec G = Φ^T Φ : trois produits par membre et par instant
+        g00 = q[:, 0, 0]**2 + q[:, 1, 0]**2
+        g01 = 2*(q[:, 0, 0]*q[:, 0, 1] + q[:, 1, 0]*q[:, 1, 1])
+        g11 = q[:, 0, 1]**2 + q[:, 1, 1]**2
+        decalage = np.arange(len(t)) * classes
+
+        comptes = np.zeros(len(t) * classes, dtype=np.int64)
+        somme_log = 0.0
+        pas = max(1, taille_bloc // len(t))
+        for debut in range(0, n, pas):
+            c = np.cos(angles[debut:debut + pas, None])
+            s = np.sin(angles[debut:debut + pas, None])
+            log_dist = 0.5*np.log10(c*c*g00 + c*s*g01 + s*s*g11) + echelle  # (bloc, len(t))
+            somme_log += log_dist[:, -1].sum()
+
+            k = ((log_dist - bas) * (classes / largeur)).astype(np.int64)
+            np.clip(k, 0, classes - 1, out=k)
+            k += decalage
+            fini = np.isfinite(log_dist)
+            comptes += np.bincount(k.ravel() if fini.all() else k[fini], minlength=len(comptes))
+
+        # percentile p : première classe où l'effectif cumulé atteint p % de l'ensemble
+        cumul = comptes.reshape(len(t), classes).cumsum(axis=1)
+        cibles = np.asarray(percentiles)[:, None, None] / 100 * np.maximum(cumul[:, -1:], 1)
+        k = (cumul[None] < cibles).sum(axis=2)
+        bandes = 10 ** (bas + (np.minimum(k, classes - 1) + 0.5) / classes * (haut - bas))
+        bandes = np.where(haut > bas, bandes, 10 ** haut)
+        taux = (somme_log / n - np.log10(eps)) * np.log(10) / t[-1]
+
+    if points_max is not None and len(t) > points_max:
+        garder = decimer_minmax(bandes, points_max)
+        t, bandes = t[garder], bandes[:, garder]
+
+    return t, bandes, taux
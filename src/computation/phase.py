@@ -1,11 +1,16 @@
+import time
+
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
+
+from computation.cache import memoiser, memoiser_lot
+from computation.propagateur import exponentielle, matrice_systeme, propager, propager_systemes
 
 # fonction pour calculer le champ de vecteurs
-def calculer_champ(a1: float, a2: float, x_range: tuple[int, int], y_range: tuple[int, int]) -> tuple[NDArray, NDArray, NDArray, NDArray]:
-    # grille de points
-    x = np.linspace(x_range[0], x_range[1], 20)
-    y = np.linspace(y_range[0], y_range[1], 20)
+def calculer_champ(a1: float, a2: float, x_range: tuple[int, int], y_range: tuple[int, int], n: int = 20) -> tuple[NDArray, NDArray, NDArray, NDArray]:
+    # grille de n x n points
+    x = np.linspace(x_range[0], x_range[1], n)
+    y = np.linspace(y_range[0], y_range[1], n)
     X, Y = np.meshgrid(x, y)
     
     # système: dx/dt = y, dy/dt = a1*x + a2*y
@@ -14,20 +19,138 @@ def calculer_champ(a1: float, a2: float, x_range: tuple[int, int], y_range: tupl
     
     return X, Y, U, V
 
+# fonction pour dessiner tout le champ en une seule trace
+def segments_champ(X: NDArray, Y: NDArray, U: NDArray, V: NDArray,
+                   echelle: float = 0.3, taille_fleche: float = 0.3,
+                   angle_fleche: float = np.pi/9) -> tuple[NDArray, NDArray]:
+    """
+    Construit les flèches du champ sous forme de coordonnées séparées par NaN.
+
+    Chaque flèche est le chemin départ -> pointe -> branche 1 -> pointe -> branche 2,
+    suivi d'un NaN qui coupe la ligne : tout le champ tient dans un seul go.Scatter.
+    """
+    x0, y0 = np.ravel(X), np.ravel(Y)
+    x1 = x0 + echelle*np.ravel(U)
+    y1 = y0 + echelle*np.ravel(V)
+
+    # branches de la pointe, orientées à partir de la direction de la flèche
+    longueur = taille_fleche * np.hypot(x1 - x0, y1 - y0)
+    direction = np.arctan2(y1 - y0, x1 - x0)
+    b1x = x1 - longueur*np.cos(direction + angle_fleche)
+    b1y = y1 - longueur*np.sin(direction + angle_fleche)
+    b2x = x1 - longueur*np.cos(direction - angle_fleche)
+    b2y = y1 - longueur*np.sin(direction - angle_fleche)
+
+    coupure = np.full_like(x0, np.nan)
+    xs = np.column_stack([x0, x1, b1x, x1, b2x, coupure]).ravel()
+    ys = np.column_stack([y0, y1, b1y, y1, b2y, coupure]).ravel()
+    return xs, ys
+
+# Intégrateurs : le système étant linéaire, un pas de chaque schéma est une
+# matrice M telle que x_{i+1} = M x_i. Un intégrateur est une fonction
+# (A, dt) -> M ; on peut en ajouter dans INTEGRATEURS.
+def _pas_euler(A: NDArray, dt: float) -> NDArray:
+    return np.eye(2) + dt*A
+
+def _pas_rk4(A: NDArray, dt: float) -> NDArray:
+    # RK4 sur un système linéaire = développement de exp(dt*A) à l'ordre 4
+    hA = dt*A
+    hA2 = hA @ hA
+    return np.eye(2) + hA + hA2/2 + hA2 @ hA/6 + hA2 @ hA2/24
+
+def _pas_symplectique(A: NDArray, dt: float) -> NDArray:
+    # Euler semi-implicite : y avance d'abord, puis x avec le nouveau y
+    a1, a2 = A[1]
+    return np.array([[1 + dt*dt*a1, dt*(1 + dt*a2)],
+                     [dt*a1, 1 + dt*a2]])
+
+def _pas_exacte(A: NDArray, dt: float) -> NDArray:
+    return exponentielle(A[1, 0], A[1, 1], [dt])[0]
+
+INTEGRATEURS = {
+    'euler': _pas_euler,
+    'rk4': _pas_rk4,
+    'symplectique': _pas_symplectique,
+    'exacte': _pas_exacte,
+}
+
 # fonction pour tracer une trajectoire
-def calculer_trajectoire(a1: float, a2: float, x0: float, y0: float, t_max:int = 10) -> tuple[NDArray, NDArray]:
-    dt = 0.05
+def calculer_trajectoire(a1: float, a2: float, x0: float, y0: float, t_max:int = 10,
+                         methode: str = 'exacte') -> tuple[NDArray, NDArray]:
+    traj = calculer_trajectoires(a1, a2, [[x0, y0]], t_max, methode=methode)
+    return traj[0, :, 0], traj[0, :, 1]
+
+# fonction pour tracer plusieurs trajectoires en une seule passe
+@memoiser(maxsize=256, quantifier=("a1", "a2"))
+def calculer_trajectoires(a1: float, a2: float, conditions_initiales: ArrayLike, t_max: int = 10,
+                          methode: str = 'exacte', dt: float = 0.05) -> NDArray:
+    """
+    Intègre toutes les conditions initiales (N, 2) ensemble.
+
+    Retourne un tableau (N, T, 2). La méthode "exacte" évalue exp(A*t) sur
+    toute la grille d'un coup ; les autres schémas de INTEGRATEURS avancent
+    les N états d'un seul produit matriciel par pas.
+    """
+    if methode not in INTEGRATEURS:
+        raise ValueError(f"Méthode d'intégration inconnue : {methode}")
+
     t = np.arange(0, t_max, dt)
     n = len(t)
-    
-    x = np.zeros(n)
-    y = np.zeros(n)
-    x[0] = x0
-    y[0] = y0
-    
-    # Euler
+    etats0 = np.asarray(conditions_initiales, dtype=float).reshape(-1, 2)
+
+    if methode == 'exacte':
+        return propager(a1, a2, etats0, t)
+
+    traj = np.empty((len(etats0), n, 2))
+    traj[:, 0] = etats0
+
+    pas = INTEGRATEURS[methode](matrice_systeme(a1, a2), dt).T
     for i in range(n-1):
-        x[i+1] = x[i] + dt * y[i]
-        y[i+1] = y[i] + dt * (a1*x[i] + a2*y[i])
-    
-    return x, y
\ No newline at end of file
+        traj[:, i+1] = traj[:, i] @ pas
+
+    return traj
+
+# fonction pour tracer les trajectoires de plusieurs systèmes en une seule passe
+@memoiser_lot(maxsize=64)
+def trajectoires_systemes(configurations: list[tuple[float, float, float, float]], t_max: int = 10,
+                          dt: float = 0.05) -> list[NDArray]:
+    """
+    Trajectoire exacte de chaque configuration (a1, a2, x0, y0), tableau (T, 2).
+
+    Les M systèmes sont propagés ensemble ; le cache est par configuration.
+    """
+    t = np.arange(0, t_max, dt)
+    a1, a2, x0, y0 = np.asarray(configurations, dtype=float).reshape(-1, 4).T
+    return list(propager_systemes(a1, a2, np.column_stack([x0, y0])[:, None], t)[:, 0])
+
+# fonction pour comparer précision et coût des intégrateurs
+def comparer_integrateurs(a1: float, a2: float, conditions_initiales: ArrayLike, t_max: int = 10,
+                          dt: float = 0.05, repetitions: int = 20) -> dict[str, tuple[float, float]]:
+    """
+    Retourne {méthode: (erreur relative max, temps moyen en secondes)}.
+
+    L'erreur est mesurée par rapport au propagateur exact, relativement à
+    l'amplitude de la trajectoire exacte. Les appels contournent le cache.
+    """
+    integrer = calculer_trajectoires.__wrapped__
+    reference = integrer(a1, a2, conditions_initiales, t_max, 'exacte', dt)
+    with np.errstate(invalid='ignore'):
+        echelle = max(1.0, float(np.nanmax(np.abs(reference))))
+
+    resultats = {}
+    for methode in INTEGRATEURS:
+        debut = time.perf_counter()
+        for _ in range(repetitions):
+            traj = integrer(a1, a2, conditions_initiales, t_max, methode, dt)
+        duree = (time.perf_counter() - debut) / repetitions
+        with np.errstate(invalid='ignore'):
+            erreur = float(np.nanmax(np.abs(traj - reference))) / echelle
+        resultats[methode] = (erreur, duree)
+    return resultats
+
+# fonction pour choisir l'intégrateur le plus rapide dans la tolérance
+def choisir_integrateur(a1: float, a2: float, conditions_initiales: ArrayLike, tolerance: float = 1e-3,
+                        t_max: int = 10, dt: float = 0.05) -> str:
+    resultats = comparer_integrateurs(a1, a2, conditions_initiales, t_max, dt)
+    valides = [m for m, (erreur, _) in resultats.items() if erreur <= tolerance]
+    return min(valides, key=lambda m: resultats[m][1])
@@ -0,0 +1,75 @@
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+# matrice du système dx/dt = y, dy/dt = a1*x + a2*y
+def matrice_systeme(a1: float, a2: float) -> NDArray:
+    return np.array([[0.0, 1.0], [a1, a2]])
+
+
+def exponentielle(a1: ArrayLike, a2: ArrayLike, t: ArrayLike) -> NDArray:
+    """
+    Calcule exp(A*t) en forme fermée pour A = [[0, 1], [a1, a2]].
+
+    Pour une matrice 2x2 de trace a2, on a
+    exp(A*t) = e^(m*t) * (cosh(s*t) I + sinh(s*t)/s (A - m I))
+    avec m = a2/2 et s = sqrt(m² + a1) (réel ou imaginaire pur).
+    Pour s réel, e^(m*t) cosh(s*t) et e^(m*t) sinh(s*t) sont formés à partir
+    de e^((m+s)*t) : e^(m*t) s'annulerait (sous-dépassement) quand cosh(s*t)
+    déborde, ce qui donnerait 0 * inf = NaN sur les longs horizons.
+    a1 et a2 peuvent être des tableaux de même forme S, le résultat
+    a alors la forme S + (len(t), 2, 2) ; t >= 0.
+    """
+    a1 = np.asarray(a1, dtype=float)[..., None]
+    a2 = np.asarray(a2, dtype=float)[..., None]
+    t = np.asarray(t, dtype=float)
+
+    m = a2 / 2
+    discriminant = m*m + a1
+    reel = discriminant >= 0
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        # s réel : e^(mt) cosh(st) = e^((m+s)t) (1 + e^(-2st)) / 2,
+        #          e^(mt) sinh(st)/s = e^((m+s)t) (1 - e^(-2st)) / (2s)  (t*e^(mt) si s = 0)
+        s = np.sqrt(np.where(reel, discriminant, 0))
+        haut = np.exp((m + s) * t)
+        ch_reel = haut * (1 + np.exp(-2*s*t)) / 2
+        sh_reel = np.where(s == 0, t * np.exp(m * t), haut * -np.expm1(-2*s*t) / np.where(s == 0, 1, 2*s))
+
+        # s = i*w imaginaire : cos et sin restent bornés
+        w = np.sqrt(np.where(reel, 1, -discriminant))
+        e = np.exp(m * t)
+        ch = np.where(reel, ch_reel, e * np.cos(w * t))
+        sh = np.where(reel, sh_reel, e * np.sin(w * t) / w)
+
+        phi = np.empty(np.broadcast(ch, a1).shape + (2, 2))
+        phi[..., 0, 0] = ch - m*sh
+        phi[..., 0, 1] = sh
+        phi[..., 1, 0] = a1 * sh
+        phi[..., 1, 1] = ch + m*sh
+    return phi
+
+
+def propager(a1: ArrayLike, a2: ArrayLike, etats0: ArrayLike, t: ArrayLike) -> NDArray:
+    """
+    Applique le propagateur exact à des états initiaux de forme (..., 2).
+
+    Retourne les états aux instants t, de forme (..., len(t), 2).
+    """
+    phi = exponentielle(a1, a2, t)
+    etats0 = np.asarray(etats0, dtype=float)
+    with np.errstate(over='ignore', invalid='ignore'):
+        return np.einsum('...tij,...j->...ti', phi, etats0)
+
+
+def propager_systemes(a1: ArrayLike, a2: ArrayLike, etats0: ArrayLike, t: ArrayLike) -> NDArray:
+    """
+    Propage plusieurs systèmes à la fois : a1 et a2 de forme (M,), etats0 de
+    forme (M, K, 2) (K états initiaux par système).
+
+    Les M propagateurs exp(A_m t) sont évalués ensemble, puis appliqués par un
+    seul produit ; retourne un tableau (M, K, len(t), 2).
+    """
+    phi = exponentielle(a1, a2, t)                                   # (M, T, 2, 2)
+    etats0 = np.asarray(etats0, dtype=float)
+    with np.errstate(over='ignore', invalid='ignore'):
+        return np.einsum('mtij,mkj->mkti', phi, etats0, optimize=True)
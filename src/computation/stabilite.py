@@ -0,0 +1,68 @@
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from computation.cache import memoiser
+
+# Types d'équilibre de dx/dt = y, dy/dt = a1*x + a2*y (codes de classifier)
+COL = 0
+NOEUD_STABLE = 1
+NOEUD_INSTABLE = 2
+FOYER_STABLE = 3
+FOYER_INSTABLE = 4
+CENTRE = 5
+DEGENERE = 6
+
+LIBELLES = {
+    COL: "Col (instable)",
+    NOEUD_STABLE: "Nœud stable",
+    NOEUD_INSTABLE: "Nœud instable",
+    FOYER_STABLE: "Foyer stable",
+    FOYER_INSTABLE: "Foyer instable",
+    CENTRE: "Centre",
+    DEGENERE: "Dégénéré (valeur propre nulle)",
+}
+
+
+def valeurs_propres(a1: ArrayLike, a2: ArrayLike) -> NDArray:
+    """
+    Valeurs propres de A = [[0, 1], [a1, a2]] en forme fermée.
+
+    λ² - a2 λ - a1 = 0, donc λ = (a2 ± sqrt(a2² + 4 a1)) / 2.
+    Retourne un tableau complexe de forme S + (2,) pour a1, a2 de forme S.
+    """
+    a1 = np.asarray(a1, dtype=float)
+    a2 = np.asarray(a2, dtype=float)
+    racine = np.sqrt((a2*a2 + 4*a1).astype(complex))
+    return np.stack([(a2 + racine) / 2, (a2 - racine) / 2], axis=-1)
+
+
+def classifier(a1: ArrayLike, a2: ArrayLike, tol: float = 1e-9) -> NDArray:
+    """
+    Type d'équilibre pour chaque couple (a1, a2), sans calculer les valeurs propres.
+
+    Avec la trace a2, le déterminant -a1 et le discriminant a2² + 4 a1 :
+    déterminant < 0 : col ; déterminant nul : dégénéré ; sinon nœud
+    (discriminant >= 0) ou foyer (discriminant < 0), stable si la trace est
+    négative, et centre pour une trace nulle. Retourne des codes int8.
+    """
+    a1, a2 = np.broadcast_arrays(np.asarray(a1, dtype=float), np.asarray(a2, dtype=float))
+    discriminant = a2*a2 + 4*a1
+
+    codes = np.where(discriminant >= -tol,
+                     np.where(a2 < 0, NOEUD_STABLE, NOEUD_INSTABLE),
+                     np.where(a2 < -tol, FOYER_STABLE, np.where(a2 > tol, FOYER_INSTABLE, CENTRE)))
+    codes = np.where(a1 > tol, COL, codes)
+    codes = np.where(np.abs(a1) <= tol, DEGENERE, codes)
+    return codes.astype(np.int8)
+
+
+@memoiser(maxsize=8, ttl=None)
+def carte_stabilite(resolution: int, a_range: tuple[float, float] = (-5.0, 5.0)) -> tuple[NDArray, NDArray]:
+    """
+    Classe toute une grille (a1, a2) de resolution x resolution points.
+
+    Retourne (valeurs, codes) : les valeurs communes aux deux axes et les
+    codes de forme (resolution, resolution), indexés [a2, a1].
+    """
+    valeurs = np.linspace(a_range[0], a_range[1], resolution)
+    return valeurs, classifier(valeurs[None, :], valeurs[:, None])
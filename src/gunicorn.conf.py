@@ -0,0 +1,25 @@
+"""
+Configuration gunicorn du dashboard (à lancer depuis src/)
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+Variables d'environnement : MODSIM_BIND (0.0.0.0:8050), MODSIM_WORKERS (4),
+MODSIM_THREADS (4) et MODSIM_SESSION_STORE (voir session_store.py).
+"""
+import os
+import tempfile
+
+bind = os.environ.get('MODSIM_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('MODSIM_WORKERS', 4))
+threads = int(os.environ.get('MODSIM_THREADS', 4))
+
+# l'application est importée et préchauffée une fois, avant le fork (wsgi.warmup)
+preload_app = True
+timeout = 60
+
+# plusieurs workers : les sessions de quiz doivent être partagées entre processus
+if workers > 1:
+    os.environ.setdefault(
+        'MODSIM_SESSION_STORE',
+        'sqlite:///' + os.path.join(tempfile.gettempdir(), 'modsim-sessions.db'),
+    )
@@ -113,6 +113,8 @@ Le comportement dépend du discriminant $\\Delta = a_2^2 + 4a_1$ :
 Le portrait de phase est un graphique dans le plan d'état ($\\mathbf{x} = [X, Y]^T$) qui montre le comportement
  qualitatif d'un système dynamique. Chaque point du plan représente un état initial possible, et le champ de vecteurs
 indiquent la direction et la vitesse du mouvement à partir de cet état.
+L'option « Densité de trajectoires » superpose plus d'un millier de trajectoires partant d'une grille régulière :
+plus un pixel est foncé, plus les trajectoires y passent souvent.
 
 ### Diagnostic de stabilité: 
 
@@ -129,6 +131,9 @@ en observant comment les trajectoires se comportent autour de ce point.
 La visualisation des trajectoires perturbées permet de tester la robustesse du système face à des conditions initiales légèrement différentes.
 Cette méthode étudie la sensibilité du système. On compare la trajectoire partant d'une condition initiale nominale
 à une autre partant d'une condition initiale légèrement perturbée.
+Le graphe du bas ajoute un ensemble de perturbations de même taille dans toutes les directions :
+la bande couvre 90 % des distances (percentiles 5 et 95) et le titre donne le taux de croissance moyen,
+$\\frac{1}{t_{max}} \\ln \\frac{||\\Delta(t_{max})||}{||\\Delta(0)||}$ (négatif : les perturbations s'amortissent).
 
 ### Diagnostic de stabilité: 
 
@@ -137,6 +142,18 @@ La distance entre les deux trajectoires doit décroître avec le temps, montrant
 La stabilité est confirmée si les deux trajectoires convergent vers le même point d'équilibre.
 
 • Système Sensible/Instable : La distance entre les trajectoires croît avec le temps, indiquant qu'une erreur minuscule s'amplifie rapidement, menant à une divergence.
+
+## 3 - Carte de stabilité
+La carte colore chaque couple $(a_1, a_2)$ selon le type de l'équilibre, lu sur la trace $a_2$,
+le déterminant $-a_1$ et le discriminant $\\Delta = a_2^2 + 4a_1$ :
+
+• $a_1 > 0$ : col (instable).
+
+• $a_1 < 0$ et $\\Delta \\geq 0$ : nœud, stable si $a_2 < 0$.
+
+• $a_1 < 0$ et $\\Delta < 0$ : foyer, stable si $a_2 < 0$, centre si $a_2 = 0$.
+
+La croix marque les coefficients choisis avec les sliders.
 """
     }
 }
@@ -1,17 +1,101 @@
+import json
+import os
+
 import dash
-from dash import dcc, html, Input, Output, State, ALL, MATCH, ctx
+from dash import dcc, html, Input, Output, State, ALL, MATCH, ctx, ClientsideFunction, Patch
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.figure_factory as ff
+from plotly.io.json import to_json_plotly
 from plotly.subplots import make_subplots
 import numpy as np
 
-from computation import phase, perturbation
+from computation import cinematique, phase, perturbation, rasterisation, stabilite
 from chatbot import get_help
-from quiz_data import QUIZ_QUESTIONS, get_question, get_total_questions
+from quiz_data import QUESTION_TIME_LIMIT, get_total_questions
 from quiz_callbacks import register_quiz_callbacks
+from metrics import instrument_callbacks
+from background import background_callback, create_background_manager
+from transport import compact_array, downcast
 
 COEFFICIENT_RANGE = (-5, 5)
+# nombre de flèches par axe dans le champ de vecteurs
+FIELD_DENSITY = 20
+# image de densité du portrait de phase : pixels par axe et trajectoires par axe de la grille de départ
+PHASE_DENSITY_PIXELS = 200
+PHASE_DENSITY_GRID = 32
+# nombre maximal de points par courbe dans le graphe de stabilité
+STABILITY_POINT_BUDGET = 2000
+# titre du graphe de séparation, complété par le taux de croissance de l'ensemble
+STABILITY_SEPARATION_TITLE = "Séparation des trajectoires dans le temps"
+# bornes du slider t_max, imposées aussi côté serveur
+HORIZON_RANGE = (10, 500)
+# ensemble de perturbations : au plus ENSEMBLE_MAX_MEMBERS directions, et au plus
+# ENSEMBLE_BUDGET distances calculées (membres x instants, ~20 ns chacune)
+ENSEMBLE_MAX_MEMBERS = 10_000
+ENSEMBLE_BUDGET = 2_000_000
+# valeurs (a1, a2) imposées par les scénarios prédéfinis
+SCENARIO_PRESETS = {
+    'ship': (-2, -0.5),
+    'door': (-2, -1.0),
+}
+
+# conditions initiales des trajectoires d'exemple du portrait de phase
+PHASE_INITIAL_CONDITIONS = [[2, 1], [-2, 1], [1, -2], [-1, -1]]
+
+# paramètres réglables (slider + champ numérique) et leur valeur par défaut
+PARAMETERS = {'a1': 0.0, 'a2': 0.0, 'x0': 1.0, 'y0': 0.0}
+
+# formes au repos (x, y) des objets animés, tournées de l'angle x(t)
+DOOR_LENGTH = 4
+SCENARIO_SHAPES = {
+    'ship': [
+        np.array([[-2, 1], [-1.5, -1], [1.5, -1], [2, 1], [1.5, 1], [-1.5, 1], [-2, 1]]),  # coque
+        np.array([[0, 1], [0, 4]]),  # mât
+    ],
+    'door': [
+        np.array([[0, 0], [DOOR_LENGTH, 0]]),
+    ],
+}
+SCENARIO_TRACE_STYLES = {
+    'ship': [
+        dict(mode='lines', fill='toself', line=dict(color='brown', width=3), name='Coque'),
+        dict(mode='lines', line=dict(color='black', width=4), name='Mât'),
+    ],
+    'door': [
+        dict(mode='lines', line=dict(color='blue', width=6), name='Porte'),
+    ],
+}
+
+# barre d'avancement des callbacks en arrière-plan, affichée pendant le calcul
+PROGRESS_VISIBLE = {'height': '6px', 'marginBottom': '8px'}
+PROGRESS_HIDDEN = {'display': 'none'}
+
+# figures des scénarios prédéfinis, sérialisées une fois (voir warm_scenario_cache)
+_scenario_figures = {}
+
+# Carte de stabilité : résolutions proposées et couleur de chaque type d'équilibre
+MAP_RESOLUTIONS = [100, 250, 500, 1000]
+MAP_COLORS = {
+    stabilite.COL: '#e15759',
+    stabilite.NOEUD_STABLE: '#4e79a7',
+    stabilite.NOEUD_INSTABLE: '#f28e2b',
+    stabilite.FOYER_STABLE: '#76b7b2',
+    stabilite.FOYER_INSTABLE: '#edc948',
+    stabilite.CENTRE: '#59a14f',
+    stabilite.DEGENERE: '#bab0ac',
+}
+
+# heatmaps de la carte, sérialisées une fois par résolution (voir build_stability_map)
+_map_traces = {}
+
+# Comparaison : configurations (a1, a2, x0, y0) épinglées, superposées dans
+# des traces réservées (une couleur par emplacement)
+MAX_PINNED = 4
+PINNED_COLORS = ['#2ca02c', '#9467bd', '#ff7f0e', '#17becf']
+
+# Indice de la première trace de chaque groupe (et de l'annotation modifiée) des
+# figures écrites par des Patch, fixé par build_*_figure au moment où le groupe est ajouté
+_figure_slots = {}
 
 # Initialiser l'application avec un thème Bootstrap
 app = dash.Dash(__name__, external_stylesheets=[
@@ -20,6 +104,127 @@ app = dash.Dash(__name__, external_stylesheets=[
     '/assets/quiz-animations.css'
 ])
 
+# Mesures par callback (temps, taille des réponses) exposées sur /metrics ;
+# profils cProfile des appels lents si MODSIM_PROFILE_DIR est défini
+callback_metrics = instrument_callbacks(
+    app,
+    profile_dir=os.environ.get('MODSIM_PROFILE_DIR'),
+    slow_ms=float(os.environ.get('MODSIM_PROFILE_SLOW_MS', 500)),
+    sample_rate=float(os.environ.get('MODSIM_PROFILE_SAMPLE', 0.1)),
+)
+
+# Simulations lourdes en arrière-plan si MODSIM_BACKGROUND_CALLBACKS=1 (voir background.py)
+background_manager = create_background_manager()
+
+
+def build_stability_figure():
+    """Figure de stabilité sans données (traces, axes et titres), construite une fois pour le layout"""
+    # deux sous-graphes : 1) portrait de phase, 2) séparation dans le temps (avec y secondaire)
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=False,
+        vertical_spacing=0.12,
+        specs=[[{"type": "xy"}], [{"type": "xy", "secondary_y": True}]],
+        subplot_titles=("Portrait de phase — trajectoire vs perturbée", STABILITY_SEPARATION_TITLE)
+    )
+    # titre du second sous-graphe, complété par le taux de croissance (update_stability_trajectory)
+    _figure_slots['stability-separation-title'] = [a.text for a in fig.layout.annotations].index(STABILITY_SEPARATION_TITLE)
+
+    # trajectoires nominale et perturbée puis leurs conditions initiales (update_stability_trajectory)
+    _figure_slots['stability-trajectories'] = len(fig.data)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Nominale', line=dict(color='royalblue')), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Perturbée', line=dict(color='firebrick', dash='dash')), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='markers', name='CI nominale', marker=dict(color='royalblue', size=8)), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='markers', name='CI perturbée', marker=dict(color='firebrick', size=8)), row=1, col=1)
+    fig.update_xaxes(title_text='x', row=1, col=1, range=COEFFICIENT_RANGE)
+    fig.update_yaxes(title_text='y', row=1, col=1, range=COEFFICIENT_RANGE)
+
+    _figure_slots['stability-separation'] = len(fig.data)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='||Δ||(t)', line=dict(color='royalblue')), row=2, col=1, secondary_y=False)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='log10(||Δ||)', line=dict(color='firebrick', dash='dot')), row=2, col=1, secondary_y=True)
+    # bande 5 %-95 % et médiane de l'ensemble de perturbations (la bande remplit jusqu'à la trace précédente)
+    _figure_slots['stability-ensemble'] = len(fig.data)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', line=dict(width=0), legendgroup='ensemble',
+                             showlegend=False, hoverinfo='skip'), row=2, col=1, secondary_y=False)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Ensemble 5-95 %', line=dict(width=0), legendgroup='ensemble',
+                             fill='tonexty', fillcolor='rgba(65, 105, 225, 0.2)'), row=2, col=1, secondary_y=False)
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Ensemble médiane', legendgroup='ensemble',
+                             line=dict(color='royalblue', width=1, dash='dash')), row=2, col=1, secondary_y=False)
+
+    # emplacements des configurations épinglées : trajectoires puis ||Δ||(t) (update_stability_overlays)
+    _figure_slots['stability-pinned-trajectories'] = len(fig.data)
+    for color in PINNED_COLORS:
+        fig.add_trace(go.Scatter(x=[], y=[], mode='lines', line=dict(color=color, width=1.5), visible=False), row=1, col=1)
+    _figure_slots['stability-pinned-distances'] = len(fig.data)
+    for color in PINNED_COLORS:
+        fig.add_trace(go.Scatter(x=[], y=[], mode='lines', line=dict(color=color, width=1.5), visible=False,
+                                 showlegend=False), row=2, col=1, secondary_y=False)
+    fig.update_xaxes(title_text='t', row=2, col=1)
+    fig.update_yaxes(title_text='distance', row=2, col=1, secondary_y=False)
+    fig.update_yaxes(title_text='log10(distance)', row=2, col=1, secondary_y=True)
+
+    fig.update_layout(
+        height=700,
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return fig
+
+
+def build_phase_figure():
+    """Portrait de phase sans données (densité, champ, trajectoires, équilibre), construit une fois pour le layout"""
+    # densité d'un ensemble de trajectoires, sous les autres traces (update_phase_density)
+    pixel = (COEFFICIENT_RANGE[1] - COEFFICIENT_RANGE[0]) / PHASE_DENSITY_PIXELS
+    fig = go.Figure()
+    _figure_slots['phase-density'] = len(fig.data)
+    fig.add_trace(go.Heatmap(
+        z=[], x0=COEFFICIENT_RANGE[0] + pixel/2, dx=pixel, y0=COEFFICIENT_RANGE[0] + pixel/2, dy=pixel,
+        zmin=0, zmax=255, colorscale='Blues', showscale=False, hoverinfo='skip', visible=False
+    ))
+
+    # champ de vecteurs (une seule trace pour toutes les flèches)
+    _figure_slots['phase-field'] = len(fig.data)
+    fig.add_trace(go.Scatter(
+        x=[], y=[],
+        mode='lines',
+        line=dict(color='steelblue', width=1),
+        name='Champ',
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+    # quelques trajectoires
+    _figure_slots['phase-trajectories'] = len(fig.data)
+    for x0, y0 in PHASE_INITIAL_CONDITIONS:
+        fig.add_trace(go.Scatter(
+            x=[], y=[],
+            mode='lines',
+            line=dict(width=2),
+            name=f'CI: ({x0},{y0})'
+        ))
+
+    # point d'équilibre
+    fig.add_trace(go.Scatter(
+        x=[0], y=[0],
+        mode='markers',
+        marker=dict(color='red', size=10, symbol='x'),
+        name='Équilibre'
+    ))
+
+    # emplacements des configurations épinglées (update_phase_overlays)
+    _figure_slots['phase-pinned'] = len(fig.data)
+    for color in PINNED_COLORS:
+        fig.add_trace(go.Scatter(x=[], y=[], mode='lines', line=dict(color=color, width=2, dash='dash'), visible=False))
+
+    fig.update_layout(
+        xaxis_title='x',
+        yaxis_title='dx/dt',
+        xaxis=dict(range=COEFFICIENT_RANGE),
+        yaxis=dict(range=COEFFICIENT_RANGE),
+        height=400
+    )
+    return fig
+
 
 # Définir le layout principal
 app.layout = dbc.Container([
@@ -53,32 +258,36 @@ app.layout = dbc.Container([
                     ),
                     html.Hr(),
                     
-                    # Sliders pour coefficients
+                    # Sliders pour coefficients : une seule valeur envoyée au relâchement
+                    # (updatemode='mouseup') et champs pris en compte après une pause de frappe
                     html.Label("Coefficient a₁:"),
-                    dcc.Slider(id='a1-slider', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0,
+                    dcc.Slider(id='a1-slider', updatemode='mouseup', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0,
                               marks={i: str(i) for i in range(COEFFICIENT_RANGE[0], COEFFICIENT_RANGE[1]+1)}),
                     # entrée manuelle pour a1
-                    dcc.Input(id='a1-input', type='number', value=0, step=0.1,
+                    dcc.Input(id='a1-input', type='number', debounce=0.5, value=0, step=0.1,
                               min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], style={'width': '100%', 'marginTop': '6px'}),
                     
                     html.Label("Coefficient a₂:"),
-                    dcc.Slider(id='a2-slider', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0,
+                    dcc.Slider(id='a2-slider', updatemode='mouseup', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0,
                               marks={i: str(i) for i in range(COEFFICIENT_RANGE[0], COEFFICIENT_RANGE[1]+1)}),
                     # entrée manuelle pour a2
-                    dcc.Input(id='a2-input', type='number', value=0, step=0.1,
+                    dcc.Input(id='a2-input', type='number', debounce=0.5, value=0, step=0.1,
                               min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], style={'width': '100%', 'marginTop': '6px'}),
                     
                     # Contrôles pour conditions initiales (cachés par défaut)
                     html.Div(id='initial-cond', style={'display': 'none'}, children=[
                         html.Hr(),
                         html.Label("Condition initiale x₀:"),
-                        dcc.Slider(id='x0-slider', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=1.0,
+                        dcc.Slider(id='x0-slider', updatemode='mouseup', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=1.0,
                                     marks={i: str(i) for i in range(COEFFICIENT_RANGE[0], COEFFICIENT_RANGE[1]+1)}),
-                        dcc.Input(id='x0-input', type='number', value=1.0, step=0.1,
+                        dcc.Input(id='x0-input', type='number', debounce=0.5, value=1.0, step=0.1,
                                     min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], style={'width': '100%', 'marginTop': '6px'}),
                         html.Label("Condition initiale y₀:"),
-                        dcc.Slider(id='y0-slider', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0.0, marks={i: str(i) for i in range(COEFFICIENT_RANGE[0], COEFFICIENT_RANGE[1]+1)}),
-                        dcc.Input(id='y0-input', type='number', value=0.0, step=0.1, min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], style={'width': '100%', 'marginTop': '6px'}),
+                        dcc.Slider(id='y0-slider', updatemode='mouseup', min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], step=0.1, value=0.0, marks={i: str(i) for i in range(COEFFICIENT_RANGE[0], COEFFICIENT_RANGE[1]+1)}),
+                        dcc.Input(id='y0-input', type='number', debounce=0.5, value=0.0, step=0.1, min=COEFFICIENT_RANGE[0], max=COEFFICIENT_RANGE[1], style={'width': '100%', 'marginTop': '6px'}),
+                        html.Label("Horizon de simulation t_max:"),
+                        dcc.Slider(id='tmax-slider', updatemode='mouseup', min=HORIZON_RANGE[0], max=HORIZON_RANGE[1], step=10, value=10,
+                                    marks={t: str(t) for t in (10, 100, 200, 300, 400, 500)}),
                      ]),
                     
                     html.Hr(),
@@ -89,11 +298,21 @@ app.layout = dbc.Container([
                         id='viz-radio',
                         options=[
                             {'label': ' Portrait de phase', 'value': 'phase'},
-                            {'label': ' Trajectoire perturbée', 'value': 'perturbed'}
+                            {'label': ' Trajectoire perturbée', 'value': 'perturbed'},
+                            {'label': ' Carte de stabilité', 'value': 'map'}
                         ],
                         value='phase',
                         labelStyle={'display': 'block'}
-                    )
+                    ),
+
+                    html.Hr(),
+
+                    # Comparaison : la configuration courante est épinglée et superposée aux figures
+                    html.Label("Comparaison :"),
+                    dbc.Button("Épingler la configuration", id='pin-button', n_clicks=0, color='secondary',
+                               size='sm', className='mb-2', style={'width': '100%'}),
+                    dcc.Dropdown(id='pinned-configs', multi=True, options=[], value=[],
+                                 placeholder=f"Aucune configuration épinglée (max. {MAX_PINNED})")
                 ])
             ], className="mb-3")
         ], width=3),
@@ -104,7 +323,8 @@ app.layout = dbc.Container([
                 dbc.Card([
                     dbc.CardHeader("Portrait de phase et trajectoires"),
                     dbc.CardBody([
-                        dcc.Graph(id='phase-portrait')
+                        dbc.Switch(id='phase-density', label="Densité de trajectoires", value=False),
+                        dcc.Graph(id='phase-portrait', figure=build_phase_figure())
                     ])
                 ], className="mb-3")
             ]),
@@ -112,16 +332,38 @@ app.layout = dbc.Container([
                 dbc.Card([
                     dbc.CardHeader("Stabilité d'une trajectoire"),
                     dbc.CardBody([
-                        dcc.Graph(id='stability-trajectory', style={'height': '600px'})
+                        # avancement du calcul, visible seulement en mode arrière-plan
+                        dbc.Progress(id='stability-progress', value=0, style={'display': 'none'}),
+                        dcc.Graph(id='stability-trajectory', figure=build_stability_figure(), style={'height': '600px'})
                     ])
                 ], className="mb-3")
 
             ]),
+            html.Div(id='card-map', style={'display': 'none'}, children=[
+                dbc.Card([
+                    dbc.CardHeader("Carte de stabilité dans le plan (a₁, a₂)"),
+                    dbc.CardBody([
+                        html.Label("Résolution de la grille :"),
+                        dcc.Dropdown(
+                            id='map-resolution',
+                            options=[{'label': f'{n} x {n}', 'value': n} for n in MAP_RESOLUTIONS],
+                            value=250,
+                            clearable=False
+                        ),
+                        dcc.Graph(id='stability-map', style={'height': '600px'})
+                    ])
+                ], className="mb-3")
+            ]),
             html.Div(id='scenario-viz-container', style={'display': 'none'}, children=[
                 dbc.Card([
                     dbc.CardHeader("Visualisation du Scénario", className="text-white bg-primary"),
                     dbc.CardBody([
-                        dcc.Graph(id='scenario-animation', style={'height': '400px'})
+                        dbc.Switch(id='scenario-client-mode', label="Animation calculée par le navigateur", value=False),
+                        dbc.Progress(id='scenario-progress', value=0, style={'display': 'none'}),
+                        dcc.Graph(id='scenario-animation', style={'height': '400px'}),
+                        dbc.Button("▶ Lecture", id='scenario-play-btn', color='primary', size='sm', style={'display': 'none'}),
+                        dcc.Store(id='scenario-data'),
+                        dcc.Interval(id='scenario-interval', interval=50, disabled=True)
                     ])
                 ], className="mb-3")
             ])
@@ -197,7 +439,7 @@ app.layout = dbc.Container([
             dbc.Card([
                 dbc.CardHeader("Quiz de Stabilité"),
                 dbc.CardBody([
-                    html.P("Testez vos connaissances avec 10 questions sur la stabilité des systèmes dynamiques.", 
+                    html.P(f"Testez vos connaissances avec {get_total_questions()} questions sur la stabilité des systèmes dynamiques.", 
                            className='mb-3'),
                     html.Div([
                         dbc.Button(
@@ -276,7 +518,16 @@ app.layout = dbc.Container([
                 )
             ], className='d-flex justify-content-center mb-3'),
             # Explication (cachée initialement)
-            html.Div(id='quiz-explanation', className='mt-4', style={'display': 'none'})
+            html.Div([
+                html.H5(id='quiz-explanation-title'),
+                # Bonne réponse, affichée seulement quand le temps est écoulé
+                html.Div([
+                    html.P("La bonne réponse était :"),
+                    html.H5(id='quiz-explanation-answer-value'),
+                    html.Hr()
+                ], id='quiz-explanation-answer', style={'display': 'none'}),
+                dcc.Markdown(id='quiz-explanation-text')
+            ], id='quiz-explanation', className='mt-4', style={'display': 'none'})
         ], id='quiz-modal-body'),
         dbc.ModalFooter([
             dbc.Button("Question suivante", id='quiz-next-btn', color='primary', style={'display': 'none'}),
@@ -286,64 +537,48 @@ app.layout = dbc.Container([
     ], id='quiz-modal', size='xl', is_open=False, backdrop='static', keyboard=False),
     
     # Stores pour le quiz
-    dcc.Store(id='quiz-state', data={'current_question': 0, 'score': 0, 'answered': False, 'total': get_total_questions()}),
-    dcc.Store(id='quiz-timer-start', data=0),
-    dcc.Interval(id='quiz-interval', interval=100, disabled=False),
+    # position dans le quiz (affichage seulement : les réponses sont enregistrées côté serveur)
+    dcc.Store(id='quiz-state', data={'current_question': 0, 'answered': False, 'revealed': False, 'total': get_total_questions()}),
+    # verdict de la dernière réponse, renvoyé par submit_quiz_answer
+    dcc.Store(id='quiz-verdict'),
+    # indice de la dernière question posée, noté par issue_next_question
+    dcc.Store(id='quiz-issued'),
+    dcc.Store(id='quiz-bank'),
+    # bornes, valeurs par défaut et scénarios prédéfinis pour assets/parameters.js
+    dcc.Store(id='parameter-config', data={'range': COEFFICIENT_RANGE, 'presets': SCENARIO_PRESETS,
+                                           'defaults': list(PARAMETERS.values())}),
+    # identifiant de la session de quiz, dont les données restent sur le serveur
+    dcc.Store(id='quiz-session'),
+    # Minuteur de 7 s d'une question : activé seulement pendant qu'une question attend sa réponse
+    dcc.Interval(id='quiz-interval', interval=QUESTION_TIME_LIMIT * 1000, disabled=True),
 
 ], fluid=True)
 
-@app.callback(
-    Output('scenario-viz-container', 'style'),
-    Output('scenario-animation', 'figure'),
-    [Input('scenario-dropdown', 'value'),
-     Input('a1-slider', 'value'),
-     Input('a2-slider', 'value'),
-     Input('x0-slider', 'value'),
-     Input('y0-slider', 'value')]
-)
-def update_scenario_visualization(scenario, a1, a2, x0, y0):
-    if scenario == 'none' or scenario is None:
-        return {'display': 'none'}, go.Figure()
-    
+def build_scenario_figure(scenario, a1, a2, x0, y0, client_side=False, set_progress=None):
+    """
+    Construit la figure du scénario (dictionnaire prêt à sérialiser).
+
+    Avec client_side=True, la figure ne contient que la position initiale :
+    les images de l'animation sont calculées par le navigateur (voir scenario_animation_data).
+    set_progress reçoit l'avancement en % (callbacks en arrière-plan).
+    """
     # Simulation commune
     t, x, y, _, _, _ = perturbation.calcul_perturbation(
-        float(a1), float(a2), float(x0), float(y0), eps=0, t_max=15.0, dt=0.1
+        a1, a2, x0, y0, eps=0, t_max=15.0, dt=0.1, methode="exacte"
     )
-    
-    frames = []
+    if set_progress is not None:
+        set_progress(50)
+
+    # positions (T, P, 2) de chaque objet, toutes les rotations en un seul calcul
+    # (réduites en float32 une fois pour toutes les frames, voir transport.downcast)
+    positions = [downcast(cinematique.tourner_forme(x, forme)) for forme in SCENARIO_SHAPES[scenario]]
+    # les coordonnées sont posées après la construction, en tableaux typés (voir transport)
+    initial_data = [go.Scatter(**style) for style in SCENARIO_TRACE_STYLES[scenario]]
+
     layout_settings = {}
-    initial_data = []
 
     # --- SCÉNARIO 1 : SHIP ---
     if scenario == 'ship':
-        # Shape
-        boat_x = np.array([-2, -1.5, 1.5, 2, 1.5, -1.5, -2])
-        boat_y = np.array([1, -1, -1, 1, 1, 1, 1])
-        mast_x = np.array([0, 0])
-        mast_y = np.array([1, 4])
-        
-        for k in range(len(t)):
-            angle = x[k]
-            c, s = np.cos(angle), np.sin(angle)
-            # Rotation
-            bx_rot = boat_x * c - boat_y * s
-            by_rot = boat_x * s + boat_y * c
-            mx_rot = mast_x * c - mast_y * s
-            my_rot = mast_x * s + mast_y * c
-            
-            frames.append(go.Frame(data=[
-                go.Scatter(x=bx_rot, y=by_rot, mode='lines', fill='toself', line=dict(color='brown', width=3)),
-                go.Scatter(x=mx_rot, y=my_rot, mode='lines', line=dict(color='black', width=4))
-            ], name=str(k)))
-
-        # Initial frame
-        angle0 = x[0]
-        c0, s0 = np.cos(angle0), np.sin(angle0)
-        initial_data = [
-            go.Scatter(x=boat_x*c0 - boat_y*s0, y=boat_x*s0 + boat_y*c0, mode='lines', fill='toself', line=dict(color='brown', width=3), name='Coque'),
-            go.Scatter(x=mast_x*c0 - mast_y*s0, y=mast_x*s0 + mast_y*c0, mode='lines', line=dict(color='black', width=4), name='Mât')
-        ]
-        
         layout_settings = dict(
             title="Simulation : Navire qui tangue",
             xaxis=dict(range=[-6, 6], visible=False),
@@ -353,21 +588,8 @@ def update_scenario_visualization(scenario, a1, a2, x0, y0):
 
     # --- SCÉNARIO 2 : DOOR ---
     elif scenario == 'door':
-        L = 4
+        L = DOOR_LENGTH
         # Vue de dessus
-        for k in range(len(t)):
-            angle = x[k]
-            door_end_x = L * np.cos(angle)
-            door_end_y = L * np.sin(angle)
-            
-            frames.append(go.Frame(data=[
-                go.Scatter(x=[0, door_end_x], y=[0, door_end_y], mode='lines', line=dict(color='blue', width=6))
-            ], name=str(k)))
-            
-        initial_data = [
-            go.Scatter(x=[0, L*np.cos(x[0])], y=[0, L*np.sin(x[0])], mode='lines', line=dict(color='blue', width=6), name='Porte')
-        ]
-        
         layout_settings = dict(
             title="Simulation : Vue de dessus de la porte",
             xaxis=dict(range=[-2, 5], visible=False),
@@ -385,66 +607,178 @@ def update_scenario_visualization(scenario, a1, a2, x0, y0):
             ]
         )
 
+    # Bouton de lecture des frames (inutile quand le navigateur anime lui-même)
+    updatemenus = [] if client_side else [dict(
+        type="buttons",
+        buttons=[dict(label="▶ Lecture",
+                    method="animate",
+                    args=[None, {"frame": {"duration": 50, "redraw": True},
+                                 "fromcurrent": True, "transition": {"duration": 0}}])]
+    )]
+
     # Création de la figure finale
     fig = go.Figure(
         data=initial_data,
         layout=go.Layout(
             **layout_settings,
-            updatemenus=[dict(
-                type="buttons",
-                buttons=[dict(label="▶ Lecture",
-                            method="animate",
-                            args=[None, {"frame": {"duration": 50, "redraw": True},
-                                         "fromcurrent": True, "transition": {"duration": 0}}])]
-            )],
+            updatemenus=updatemenus,
             plot_bgcolor="white"
-        ),
-        frames=frames
+        )
+    ).to_plotly_json()
+    for trace, pos in zip(fig['data'], positions):
+        trace['x'] = compact_array(pos[0, :, 0])
+        trace['y'] = compact_array(pos[0, :, 1])
+
+    # Les frames ne font que découper le tableau des positions : le style des
+    # traces est conservé par Plotly d'une image à l'autre
+    if not client_side:
+        fig['frames'] = [
+            dict(name=str(k), data=[dict(x=compact_array(pos[k, :, 0]), y=compact_array(pos[k, :, 1]))
+                                    for pos in positions])
+            for k in range(len(t))
+        ]
+
+    return fig
+
+
+def scenario_animation_data(scenario, a1, a2, x0, y0):
+    """Série des angles et formes au repos, à faire tourner par le navigateur"""
+    t, x, y, _, _, _ = perturbation.calcul_perturbation(
+        a1, a2, x0, y0, eps=0, t_max=15.0, dt=0.1, methode="exacte"
     )
+    return {
+        'angles': np.round(x, 5).tolist(),
+        'shapes': [{'x': forme[:, 0].tolist(), 'y': forme[:, 1].tolist()}
+                   for forme in SCENARIO_SHAPES[scenario]],
+    }
 
-    return {'display': 'block'}, fig
 
+def _scenario_key(scenario, a1, a2, x0, y0):
+    return (scenario, round(a1, 3), round(a2, 3), round(x0, 3), round(y0, 3))
 
-@app.callback(
+
+def warm_scenario_cache(x0=1.0, y0=0.0):
+    """Construit une fois les figures des scénarios prédéfinis, déjà sérialisées"""
+    for scenario, (a1, a2) in SCENARIO_PRESETS.items():
+        fig = build_scenario_figure(scenario, a1, a2, x0, y0)
+        _scenario_figures[_scenario_key(scenario, a1, a2, x0, y0)] = json.loads(to_json_plotly(fig))
+
+
+@background_callback(
+    app, background_manager,
+    Output('scenario-viz-container', 'style'),
+    Output('scenario-animation', 'figure'),
+    Output('scenario-data', 'data'),
+    Output('scenario-play-btn', 'style'),
+    Output('scenario-interval', 'disabled'),
+    [Input('scenario-dropdown', 'value'),
+     Input('a1-slider', 'value'),
+     Input('a2-slider', 'value'),
+     Input('x0-slider', 'value'),
+     Input('y0-slider', 'value'),
+     Input('scenario-client-mode', 'value')],
+    progress=Output('scenario-progress', 'value'),
+    running=[(Output('scenario-progress', 'style'), PROGRESS_VISIBLE, PROGRESS_HIDDEN)],
+)
+def update_scenario_visualization(scenario, a1, a2, x0, y0, client_side, set_progress=None):
+    if scenario == 'none' or scenario is None:
+        return {'display': 'none'}, go.Figure(), None, {'display': 'none'}, True
+
+    a1, a2, x0, y0 = float(a1), float(a2), float(x0), float(y0)
+
+    # Mode navigateur : seulement la position initiale et la série des angles
+    if client_side:
+        return ({'display': 'block'},
+                build_scenario_figure(scenario, a1, a2, x0, y0, client_side=True),
+                scenario_animation_data(scenario, a1, a2, x0, y0),
+                {'display': 'inline-block'},
+                True)
+
+    # les valeurs prédéfinies du scénario sont servies sans reconstruire la figure
+    # (construites au premier scénario demandé plutôt qu'au démarrage)
+    if not _scenario_figures:
+        warm_scenario_cache()
+    fig = _scenario_figures.get(_scenario_key(scenario, a1, a2, x0, y0))
+    if fig is None:
+        fig = build_scenario_figure(scenario, a1, a2, x0, y0, set_progress=set_progress)
+    return {'display': 'block'}, fig, None, {'display': 'none'}, True
+
+
+# Animation du scénario calculée dans le navigateur (assets/scenario-animation.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='scenario', function_name='play'),
+    Output('scenario-interval', 'disabled', allow_duplicate=True),
+    Output('scenario-interval', 'n_intervals'),
+    Input('scenario-play-btn', 'n_clicks'),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    ClientsideFunction(namespace='scenario', function_name='animate'),
+    Output('scenario-animation', 'figure', allow_duplicate=True),
+    Output('scenario-interval', 'disabled', allow_duplicate=True),
+    Input('scenario-interval', 'n_intervals'),
+    State('scenario-data', 'data'),
+    State('scenario-animation', 'figure'),
+    prevent_initial_call=True
+)
+
+
+def _write_series(fig, first, series):
+    """Écrit les séries (x, y) dans les traces first, first+1, ... d'un Patch"""
+    for i, (xs, ys) in enumerate(series, start=first):
+        fig['data'][i]['x'] = compact_array(xs)
+        fig['data'][i]['y'] = compact_array(ys)
+
+
+def _horizon(t_max):
+    """t_max envoyé par le client, ramené dans HORIZON_RANGE (taille des tableaux en len(t))"""
+    t_max = float(t_max)
+    if not np.isfinite(t_max):
+        return float(HORIZON_RANGE[0])
+    return float(np.clip(t_max, *HORIZON_RANGE))
+
+
+# en mode arrière-plan, le calcul est aussi annulé quand on quitte cette vue
+@background_callback(
+    app, background_manager,
     Output('stability-trajectory', 'figure'),
     [Input('a1-slider', 'value'),
      Input('a2-slider', 'value'),
      Input('x0-slider', 'value'),
-     Input('y0-slider', 'value')],
+     Input('y0-slider', 'value'),
+     Input('tmax-slider', 'value')],
+    progress=Output('stability-progress', 'value'),
+    running=[(Output('stability-progress', 'style'), PROGRESS_VISIBLE, PROGRESS_HIDDEN)],
+    cancel=[Input('viz-radio', 'value')],
 )
-def update_stability_trajectory(a1, a2, x0, y0):
-    # calcul des trajectoires nominale et perturbée
+def update_stability_trajectory(a1, a2, x0, y0, t_max=10.0, set_progress=None):
+    t_max = _horizon(t_max)
+    # calcul des trajectoires nominale et perturbée (décimées pour les longs horizons)
     t, x, y, x_p, y_p, dist = perturbation.calcul_perturbation(
-        float(a1), float(a2), float(x0), float(y0), eps=1e-3, t_max=10.0, dt=0.05
+        float(a1), float(a2), float(x0), float(y0), eps=1e-3, t_max=t_max, dt=0.05,
+        methode="exacte", points_max=STABILITY_POINT_BUDGET
     )
+    if set_progress is not None:
+        set_progress(50)
 
-    # deux sous-graphes : 1) portrait de phase, 2) séparation dans le temps (avec y secondaire)
-    fig = make_subplots(
-        rows=2, cols=1,
-        shared_xaxes=False,
-        vertical_spacing=0.12,
-        specs=[[{"type": "xy"}], [{"type": "xy", "secondary_y": True}]],
-        subplot_titles=("Portrait de phase — trajectoire vs perturbée", "Séparation des trajectoires dans le temps")
+    # ensemble de directions de même norme que la perturbation (eps, eps) ;
+    # moins de membres pour les longs horizons afin de tenir le budget de calcul
+    instants = int(t_max / 0.05) + 1
+    t_e, bandes, taux = perturbation.ensemble_perturbation(
+        float(a1), float(a2), eps=np.hypot(1e-3, 1e-3),
+        n=int(np.clip(ENSEMBLE_BUDGET // instants, 100, ENSEMBLE_MAX_MEMBERS)),
+        t_max=t_max, dt=0.05, percentiles=(5, 95, 50), points_max=STABILITY_POINT_BUDGET
     )
 
-    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name='Nominale', line=dict(color='royalblue')), row=1, col=1)
-    fig.add_trace(go.Scatter(x=x_p, y=y_p, mode='lines', name='Perturbée', line=dict(color='firebrick', dash='dash')), row=1, col=1)
-    fig.add_trace(go.Scatter(x=[x[0]], y=[y[0]], mode='markers', name='CI nominale', marker=dict(color='royalblue', size=8)), row=1, col=1)
-    fig.add_trace(go.Scatter(x=[x_p[0]], y=[y_p[0]], mode='markers', name='CI perturbée', marker=dict(color='firebrick', size=8)), row=1, col=1)
-    fig.update_xaxes(title_text='x', row=1, col=1, range=COEFFICIENT_RANGE)
-    fig.update_yaxes(title_text='y', row=1, col=1, range=COEFFICIENT_RANGE)
-
-    fig.add_trace(go.Scatter(x=t, y=dist, mode='lines', name='||Δ||(t)', line=dict(color='royalblue')), row=2, col=1, secondary_y=False)
-    fig.add_trace(go.Scatter(x=t, y=np.log10(dist + 1e-15), mode='lines', name='log10(||Δ||)', line=dict(color='firebrick', dash='dot')), row=2, col=1, secondary_y=True)
-    fig.update_xaxes(title_text='t', row=2, col=1)
-    fig.update_yaxes(title_text='distance', row=2, col=1, secondary_y=False)
-    fig.update_yaxes(title_text='log10(distance)', row=2, col=1, secondary_y=True)
-
-    fig.update_layout(
-        height=700,
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
-        margin=dict(l=40, r=40, t=80, b=40)
-    )
+    # seules les données des traces changent : axes et titres viennent de build_stability_figure
+    fig = Patch()
+    _write_series(fig, _figure_slots['stability-trajectories'],
+                  [(x, y), (x_p, y_p), (x[:1], y[:1]), (x_p[:1], y_p[:1])])
+    _write_series(fig, _figure_slots['stability-separation'], [(t, dist), (t, np.log10(dist + 1e-15))])
+    _write_series(fig, _figure_slots['stability-ensemble'], [(t_e, bandes[0]), (t_e, bandes[1]), (t_e, bandes[2])])
+    fig['layout']['annotations'][_figure_slots['stability-separation-title']]['text'] = (
+        f"{STABILITY_SEPARATION_TITLE} — taux de croissance ≈ {taux:.3f} / unité de temps")
     return fig
 
 
@@ -456,137 +790,209 @@ def update_stability_trajectory(a1, a2, x0, y0):
 )
 def update_phase_portrait(a1, a2):
     
-    X, Y, U, V = phase.calculer_champ(a1, a2, COEFFICIENT_RANGE, COEFFICIENT_RANGE) # calcul du champ de vecteurs
-    fig = ff.create_quiver(X, Y, U, V)
-    
-    # ajout du champ
-    for i in range(len(X)):
-        for j in range(len(X[0])):
-            fig.add_trace(go.Scatter(
-                x=[X[i,j], X[i,j] + 0.3*U[i,j]], 
-                y=[Y[i,j], Y[i,j] + 0.3*V[i,j]],
-                mode='lines',
-                line=dict(color='lightblue', width=1),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-    
-    # quelques trajectoires
-    conditions_initiales = [[2, 1], [-2, 1], [1, -2], [-1, -1]]
-    for x0, y0 in conditions_initiales:
-        x_traj, y_traj = phase.calculer_trajectoire(a1, a2, x0, y0)
-        fig.add_trace(go.Scatter(
-            x=x_traj, y=y_traj,
-            mode='lines',
-            line=dict(width=2),
-            name=f'CI: ({x0},{y0})'
-        ))
-    
-    # point d'équilibre
-    fig.add_trace(go.Scatter(
-        x=[0], y=[0],
-        mode='markers',
-        marker=dict(color='red', size=10, symbol='x'),
-        name='Équilibre'
-    ))
-    
-    fig.update_layout(
-        xaxis_title='x',
-        yaxis_title='dx/dt',
-        xaxis=dict(range=COEFFICIENT_RANGE),
-        yaxis=dict(range=COEFFICIENT_RANGE),
-        height=400
-    )
-    
+    X, Y, U, V = phase.calculer_champ(a1, a2, COEFFICIENT_RANGE, COEFFICIENT_RANGE, n=FIELD_DENSITY) # calcul du champ de vecteurs
+    # longueur des flèches proportionnelle à l'espacement de la grille
+    xs, ys = phase.segments_champ(X, Y, U, V, echelle=6 / FIELD_DENSITY)
+    trajectoires = phase.calculer_trajectoires(a1, a2, PHASE_INITIAL_CONDITIONS)
+
+    # seules les données du champ et des trajectoires changent (voir build_phase_figure)
+    fig = Patch()
+    _write_series(fig, _figure_slots['phase-field'], [(xs, ys)])
+    _write_series(fig, _figure_slots['phase-trajectories'], [(traj[:, 0], traj[:, 1]) for traj in trajectoires])
+    return fig
+
+def _map_title(a1, a2):
+    label = stabilite.LIBELLES[int(stabilite.classifier(a1, a2))]
+    return f"Point courant (a₁ = {a1:g}, a₂ = {a2:g}) : {label}"
+
+
+def build_stability_map(resolution, a1, a2):
+    """Carte de stabilité (heatmap des types d'équilibre) avec le point courant"""
+    heatmap = _map_traces.get(resolution)
+    if heatmap is None:
+        valeurs, codes = stabilite.carte_stabilite(resolution, COEFFICIENT_RANGE)
+        n = len(MAP_COLORS)
+        # échelle de couleurs discrète : un palier par code
+        colorscale = [[(code + k) / n, color] for code, color in MAP_COLORS.items() for k in (0, 1)]
+        heatmap = go.Heatmap(
+            x0=valeurs[0], dx=valeurs[1] - valeurs[0], y0=valeurs[0], dy=valeurs[1] - valeurs[0],
+            zmin=-0.5, zmax=n - 0.5, colorscale=colorscale,
+            colorbar=dict(tickvals=list(MAP_COLORS), ticktext=[stabilite.LIBELLES[c] for c in MAP_COLORS]),
+            hovertemplate='a₁ = %{x:.2f}<br>a₂ = %{y:.2f}<extra></extra>'
+        ).to_plotly_json()
+        # codes int8 en tableau typé 2D (1 octet par point), sans passer par la
+        # validation plotly qui les convertirait en listes imbriquées
+        heatmap['z'] = compact_array(codes)
+        _map_traces[resolution] = heatmap
+
+    marker = go.Scatter(x=[a1], y=[a2], mode='markers', name='Point courant',
+                        marker=dict(color='black', size=12, symbol='x'))
+    fig = go.Figure(
+        data=[marker],
+        layout=go.Layout(
+            title=_map_title(a1, a2),
+            xaxis=dict(title='a₁', range=COEFFICIENT_RANGE),
+            yaxis=dict(title='a₂', range=COEFFICIENT_RANGE),
+            height=600
+        )
+    ).to_plotly_json()
+    fig['data'].insert(0, heatmap)
     return fig
 
-# Sync A1 Slider with A1 input
+
+# Carte complète : seulement quand la résolution change (grille classée et mise en cache)
 @app.callback(
-    Output('a1-slider', 'value'),
-    Output('a1-input', 'value'),
+    Output('stability-map', 'figure'),
+    Input('map-resolution', 'value'),
+    State('a1-slider', 'value'),
+    State('a2-slider', 'value'),
+)
+def update_stability_map(resolution, a1, a2):
+    # valeur envoyée par le client : seules les résolutions proposées sont calculées et gardées dans _map_traces
+    if resolution not in MAP_RESOLUTIONS:
+        raise dash.exceptions.PreventUpdate
+    return build_stability_map(int(resolution), float(a1), float(a2))
+
+
+# Déplacement des coefficients : seul le point courant et le titre changent
+@app.callback(
+    Output('stability-map', 'figure', allow_duplicate=True),
     Input('a1-slider', 'value'),
-    Input('a1-input', 'value'),
-    Input('scenario-dropdown', 'value')
+    Input('a2-slider', 'value'),
+    prevent_initial_call=True
 )
-def sync_a1(slider_val, input_val, scenario):
-    ctx = dash.callback_context
-    # valeur par défaut / initialisation
-    if not ctx.triggered:
-        try:
-            v = float(slider_val)
-        except (TypeError, ValueError):
-            v = 0.0
-    else:
-        trigger = ctx.triggered[0]['prop_id'].split('.')[0]
-        if trigger == 'scenario-dropdown':
-            if scenario == 'ship' or scenario == 'door':
-                v = -2
-            else:
-                try:
-                    v = float(slider_val)
-                except (TypeError, ValueError):
-                    v = 0.0
-        elif trigger == 'a1-input':
-            try:
-                v = float(input_val)
-            except (TypeError, ValueError):
-                v = 0.0
-        else:
-            try:
-                v = float(slider_val)
-            except (TypeError, ValueError):
-                v = 0.0
+def update_stability_map_point(a1, a2):
+    a1, a2 = float(a1), float(a2)
+    fig = Patch()
+    fig['data'][1]['x'] = [a1]
+    fig['data'][1]['y'] = [a2]
+    fig['layout']['title']['text'] = _map_title(a1, a2)
+    return fig
 
-    v = max(COEFFICIENT_RANGE[0], min(COEFFICIENT_RANGE[1], v))
-    v = round(v, 3)
-    return v, v
 
-# Sync A2 Slider with A2 input
+# Densité de trajectoires : une image (1 octet par pixel) au lieu d'une trace par trajectoire
 @app.callback(
-    Output('a2-slider', 'value'),
-    Output('a2-input', 'value'),
+    Output('phase-portrait', 'figure', allow_duplicate=True),
+    Input('phase-density', 'value'),
+    Input('a1-slider', 'value'),
     Input('a2-slider', 'value'),
-    Input('a2-input', 'value'),
-    Input('scenario-dropdown', 'value')
+    prevent_initial_call=True
 )
-def sync_a2(slider_val, input_val, scenario):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        try:
-            v = float(slider_val)
-        except (TypeError, ValueError):
-            v = 0.0
-    else:
-        trigger = ctx.triggered[0]['prop_id'].split('.')[0]
-        if trigger == 'scenario-dropdown':
-            if scenario == 'ship':
-                v = -0.5
-            elif scenario == 'door':
-                v = -1.0
-            else:
-                try:
-                    v = float(slider_val)
-                except (TypeError, ValueError):
-                    v = 0.0
-        elif trigger == 'a2-input':
-            try:
-                v = float(input_val)
-            except (TypeError, ValueError):
-                v = 0.0
+def update_phase_density(enabled, a1, a2):
+    triggered = dash.callback_context.triggered_id
+    if not enabled and triggered != 'phase-density':
+        return dash.no_update
+
+    fig = Patch()
+    trace = fig['data'][_figure_slots['phase-density']]
+    if not enabled:
+        trace['z'] = []
+        trace['visible'] = False
+        return fig
+
+    image = rasterisation.densite_trajectoires(
+        float(a1), float(a2), COEFFICIENT_RANGE, COEFFICIENT_RANGE,
+        n=PHASE_DENSITY_GRID, pixels=(PHASE_DENSITY_PIXELS, PHASE_DENSITY_PIXELS))
+    # un passage de trajectoire par pixel compte pour 1 (échelle logarithmique)
+    pixel = (COEFFICIENT_RANGE[1] - COEFFICIENT_RANGE[0]) / PHASE_DENSITY_PIXELS
+    trace['z'] = compact_array(rasterisation.ombrer(image, unite=pixel))
+    trace['visible'] = True
+    return fig
+
+
+def _pinned_configurations(pinned):
+    """(a1, a2, x0, y0) des MAX_PINNED premières configurations épinglées"""
+    return [tuple(float(v) for v in key.split(',')) for key in (pinned or [])[:MAX_PINNED]]
+
+
+@app.callback(
+    Output('pinned-configs', 'options'),
+    Output('pinned-configs', 'value'),
+    Input('pin-button', 'n_clicks'),
+    [State(f'{name}-slider', 'value') for name in PARAMETERS],
+    State('pinned-configs', 'options'),
+    State('pinned-configs', 'value'),
+    prevent_initial_call=True
+)
+def pin_configuration(n_clicks, a1, a2, x0, y0, options, pinned):
+    key = ','.join(f'{float(v):g}' for v in (a1, a2, x0, y0))
+    if key not in [option['value'] for option in options]:
+        label = f'a₁={float(a1):g}, a₂={float(a2):g}, x₀={float(x0):g}, y₀={float(y0):g}'
+        options = options + [{'label': label, 'value': key}]
+    # la plus ancienne configuration cède sa place au-delà de MAX_PINNED
+    pinned = ([p for p in pinned if p != key] + [key])[-MAX_PINNED:]
+    return options, pinned
+
+
+def _fill_pinned_slots(fig, first, configurations, series):
+    """Écrit les séries (x, y) dans les emplacements first, first+1, ... et masque les autres"""
+    for slot in range(MAX_PINNED):
+        trace = fig['data'][first + slot]
+        if slot < len(series):
+            xs, ys = series[slot]
+            trace['x'] = compact_array(xs)
+            trace['y'] = compact_array(ys)
+            trace['name'] = '({:g}, {:g}, {:g}, {:g})'.format(*configurations[slot])
+            trace['visible'] = True
         else:
-            try:
-                v = float(slider_val)
-            except (TypeError, ValueError):
-                v = 0.0
+            trace['x'] = []
+            trace['y'] = []
+            trace['visible'] = False
 
-    v = max(COEFFICIENT_RANGE[0], min(COEFFICIENT_RANGE[1], v))
-    v = round(v, 3)
-    return v, v
+
+# Superpositions des configurations épinglées : seules les configurations
+# nouvelles sont calculées (cache par configuration), en un seul lot
+@app.callback(
+    Output('stability-trajectory', 'figure', allow_duplicate=True),
+    Input('pinned-configs', 'value'),
+    Input('tmax-slider', 'value'),
+    prevent_initial_call=True
+)
+def update_stability_overlays(pinned, t_max):
+    configurations = _pinned_configurations(pinned)
+    resultats = perturbation.perturbations_systemes(
+        configurations, eps=1e-3, t_max=_horizon(t_max), dt=0.05, points_max=STABILITY_POINT_BUDGET)
+
+    # trajectoires (haut) puis ||Δ||(t) (bas), emplacements de build_stability_figure
+    fig = Patch()
+    _fill_pinned_slots(fig, _figure_slots['stability-pinned-trajectories'], configurations,
+                       [(x, y) for _, x, y, _, _, _ in resultats])
+    _fill_pinned_slots(fig, _figure_slots['stability-pinned-distances'], configurations,
+                       [(t, dist) for t, *_, dist in resultats])
+    return fig
+
+
+@app.callback(
+    Output('phase-portrait', 'figure', allow_duplicate=True),
+    Input('pinned-configs', 'value'),
+    prevent_initial_call=True
+)
+def update_phase_overlays(pinned):
+    configurations = _pinned_configurations(pinned)
+    trajectoires = phase.trajectoires_systemes(configurations)
+
+    # emplacements de build_phase_figure, après l'équilibre
+    fig = Patch()
+    _fill_pinned_slots(fig, _figure_slots['phase-pinned'], configurations, [(traj[:, 0], traj[:, 1]) for traj in trajectoires])
+    return fig
+
+
+# Synchronisation slider <-> champ des quatre paramètres, dans le navigateur
+# (assets/parameters.js) : aucun appel serveur avant les callbacks de figures
+app.clientside_callback(
+    ClientsideFunction(namespace='parameters', function_name='sync'),
+    [Output(f'{name}-{kind}', 'value') for kind in ('slider', 'input') for name in PARAMETERS],
+    [Input(f'{name}-{kind}', 'value') for name in PARAMETERS for kind in ('slider', 'input')],
+    Input('scenario-dropdown', 'value'),
+    State('parameter-config', 'data'),
+    prevent_initial_call=True
+)
 
 @app.callback(
     Output('card-phase', 'style'),
     Output('card-time', 'style'),
     Output('initial-cond', 'style'),
+    Output('card-map', 'style'),
     Input('viz-radio', 'value'),
 )
 def show_only(selected):
@@ -594,74 +1000,14 @@ def show_only(selected):
     hide = {'display': 'none'}
 
     if selected == 'phase':
-        return show, hide, hide
+        return show, hide, hide, hide
     elif selected == 'stability-trajectory':
-        return hide, show, hide
+        return hide, show, hide, hide
+    elif selected == 'map':
+        return hide, hide, hide, show
     # 'perturbed' ou 'stability' : afficher la carte "Stabilité" et les contrôles initiales
-    return hide,  show, show
-
-
-# Sync x0 Slider with x0 input
-@app.callback(
-    Output('x0-slider', 'value'),
-    Output('x0-input', 'value'),
-    Input('x0-slider', 'value'),
-    Input('x0-input', 'value'),
-)
-def sync_x0(slider_val, input_val):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        try:
-            v = float(slider_val)
-        except (TypeError, ValueError):
-            v = 1.0
-    else:
-        trigger = ctx.triggered[0]['prop_id'].split('.')[0]
-        if trigger == 'x0-input':
-            try:
-                v = float(input_val)
-            except (TypeError, ValueError):
-                v = 1.0
-        else:
-            try:
-                v = float(slider_val)
-            except (TypeError, ValueError):
-                v = 1.0
-
-    v = max(COEFFICIENT_RANGE[0], min(COEFFICIENT_RANGE[1], v))
-    v = round(v, 3)
-    return v, v
-
-# Sync y0 Slider with y0 input
-@app.callback(
-    Output('y0-slider', 'value'),
-    Output('y0-input', 'value'),
-    Input('y0-slider', 'value'),
-    Input('y0-input', 'value'),
-)
-def sync_y0(slider_val, input_val):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        try:
-            v = float(slider_val)
-        except (TypeError, ValueError):
-            v = 0.0
-    else:
-        trigger = ctx.triggered[0]['prop_id'].split('.')[0]
-        if trigger == 'y0-input':
-            try:
-                v = float(input_val)
-            except (TypeError, ValueError):
-                v = 0.0
-        else:
-            try:
-                v = float(slider_val)
-            except (TypeError, ValueError):
-                v = 0.0
+    return hide,  show, show, hide
 
-    v = max(COEFFICIENT_RANGE[0], min(COEFFICIENT_RANGE[1], v))
-    v = round(v, 3)
-    return v, v
 
 # Assistant pédagogique callback avec animations dynamiques
 @app.callback(
@@ -717,4 +1063,9 @@ register_quiz_callbacks(app)
 
 
 if __name__ == '__main__':
+    # en arrière-plan, chaque calcul tourne dans un processus créé par fork de
+    # celui-ci : les figures prédéfinies y sont prêtes au lieu d'être refaites à chaque calcul
+    # (wsgi.py les prépare de même dans le maître gunicorn)
+    if background_manager is not None:
+        warm_scenario_cache()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Instrumentation des callbacks Dash
+
+instrument_callbacks(app) enveloppe chaque callback enregistré ensuite avec
+app.callback et mesure, par callback :
+- le nombre d'appels et d'erreurs,
+- le temps total de la requête, le temps de calcul de la fonction et le reste
+  (sérialisation de la réponse par Dash),
+- la taille de la réponse envoyée au navigateur.
+
+Les histogrammes sont exposés au format texte Prometheus sur /metrics.
+Optionnellement, une fraction des appels est profilée avec cProfile et le
+profil est écrit sur disque quand l'appel dépasse un seuil.
+"""
+import cProfile
+import functools
+import os
+import random
+import threading
+import time
+
+import flask
+
+from computation.cache import statistiques_caches
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+UPDATE_PATH = '_dash-update-component'
+
+
+class Histogram:
+    """Histogramme cumulatif à seaux fixes (sémantique Prometheus)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def render(self, name, labels):
+        lines = [f'{name}_bucket{{{labels},le="{bound:g}"}} {n}'
+                 for bound, n in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class CallbackMetrics:
+    """Métriques agrégées par identifiant de callback (sortie Dash)"""
+
+    HISTOGRAMS = {
+        'dash_callback_duration_seconds': ('wall', DURATION_BUCKETS, 'Temps total de la requête du callback'),
+        'dash_callback_compute_seconds': ('compute', DURATION_BUCKETS, 'Temps passé dans la fonction du callback'),
+        'dash_callback_serialization_seconds': ('serialization', DURATION_BUCKETS, 'Temps de la requête hors fonction (sérialisation)'),
+        'dash_callback_payload_bytes': ('payload', SIZE_BUCKETS, 'Taille de la réponse envoyée'),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = {}
+
+    def _entry(self, callback_id):
+        entry = self._callbacks.get(callback_id)
+        if entry is None:
+            entry = {'calls': 0, 'errors': 0}
+            entry.update({key: Histogram(buckets) for key, buckets, _ in self.HISTOGRAMS.values()})
+            self._callbacks[callback_id] = entry
+        return entry
+
+    def observe(self, callback_id, wall, compute, payload, error=False):
+        with self._lock:
+            entry = self._entry(callback_id)
+            entry['calls'] += 1
+            entry['errors'] += int(error)
+            entry['wall'].observe(wall)
+            entry['compute'].observe(compute)
+            entry['serialization'].observe(max(wall - compute, 0.0))
+            entry['payload'].observe(payload)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            callbacks = sorted(self._callbacks.items())
+            for name, help_text in (('dash_callback_calls_total', "Nombre d'appels"),
+                                    ('dash_callback_errors_total', "Nombre d'appels en erreur (statut >= 400)")):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                key = 'calls' if name.endswith('calls_total') else 'errors'
+                lines += [f'{name}{{{_labels(cid)}}} {entry[key]}' for cid, entry in callbacks]
+            for name, (key, _, help_text) in self.HISTOGRAMS.items():
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for cid, entry in callbacks:
+                    lines += entry[key].render(name, _labels(cid))
+
+        # caches de calcul (computation.cache)
+        caches = statistiques_caches()
+        for field in ('hits', 'misses', 'expirations'):
+            name = f'computation_cache_{field}_total'
+            lines += [f'# TYPE {name} counter']
+            lines += [f'{name}{{cache="{nom}"}} {getattr(info, field)}' for nom, info in caches.items()]
+        lines += ['# TYPE computation_cache_size gauge']
+        lines += [f'computation_cache_size{{cache="{nom}"}} {info.currsize}' for nom, info in caches.items()]
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(callback_id):
+    escaped = callback_id.replace('\\', '\\\\').replace('"', '\\"')
+    return f'callback="{escaped}"'
+
+
+class Profiler:
+    """Profile une fraction des appels, et n'écrit que ceux qui sont lents"""
+
+    def __init__(self, directory, slow_ms=500.0, sample_rate=0.1):
+        self.directory = directory
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        # un seul profileur actif à la fois dans le processus
+        self._busy = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def call(self, func, *args, **kwargs):
+        if random.random() >= self.sample_rate or not self._busy.acquire(blocking=False):
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._busy.release()
+            if elapsed_ms >= self.slow_ms:
+                path = os.path.join(self.directory, f'{func.__name__}-{int(time.time() * 1000)}.prof')
+                profile.dump_stats(path)
+
+
+def instrument_callbacks(app, profile_dir=None, slow_ms=500.0, sample_rate=0.1):
+    """
+    Instrumente les callbacks enregistrés après cet appel et ajoute la route /metrics.
+
+    profile_dir : dossier où écrire les profils cProfile des appels lents
+    (désactivé si None).
+    """
+    metrics = CallbackMetrics()
+    profiler = Profiler(profile_dir, slow_ms, sample_rate) if profile_dir else None
+    register = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+
+        def wrap(func):
+            @functools.wraps(func)
+            def timed(*func_args, **func_kwargs):
+                start = time.perf_counter()
+                try:
+                    if profiler is not None:
+                        return profiler.call(func, *func_args, **func_kwargs)
+                    return func(*func_args, **func_kwargs)
+                finally:
+                    # hors requête (appel direct, processus de fond) : rien à rattacher
+                    if flask.has_request_context():
+                        flask.g.callback_compute = time.perf_counter() - start
+            return decorator(timed)
+        return wrap
+
+    app.callback = callback
+    server = app.server
+
+    @server.before_request
+    def start_timer():
+        if flask.request.path.endswith(UPDATE_PATH):
+            flask.g.callback_start = time.perf_counter()
+
+    @server.after_request
+    def record(response):
+        start = flask.g.get('callback_start')
+        if start is not None:
+            body = flask.request.get_json(silent=True) or {}
+            metrics.observe(
+                str(body.get('output', 'unknown')),
+                wall=time.perf_counter() - start,
+                compute=flask.g.get('callback_compute', 0.0),
+                payload=response.calculate_content_length() or 0,
+                error=response.status_code >= 400,
+            )
+        return response
+
+    server.add_url_rule('/metrics', 'metrics',
+                        lambda: flask.Response(metrics.render(), mimetype='text/plain; version=0.0.4'))
+    return metrics
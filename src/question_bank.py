@@ -0,0 +1,80 @@
+"""
+Banque de questions stockée au format JSON Lines (une question par ligne)
+
+Chaque ligne contient au minimum "id", "question", "answer" et
+"explanation", et optionnellement "topic", "tags" et "difficulty".
+
+Le fichier n'est jamais chargé entièrement en mémoire : au premier accès,
+on le parcourt une fois pour construire les index (position de chaque
+question dans le fichier, puis id par thème, tag et difficulté). Une
+question est ensuite relue à la demande par un seek, en O(1).
+"""
+import json
+import random
+import threading
+
+
+class QuestionBank:
+    """Banque de questions indexée, chargée paresseusement"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets = None  # id -> position de la ligne dans le fichier
+        self._by_topic = {}
+        self._by_tag = {}
+        self._by_difficulty = {}
+
+    def _index(self):
+        if self._offsets is not None:
+            return
+        with self._lock:
+            if self._offsets is not None:
+                return
+            offsets, by_topic, by_tag, by_difficulty = {}, {}, {}, {}
+            with open(self.path, 'rb') as f:
+                offset = f.tell()
+                for line in iter(f.readline, b''):
+                    if line.strip():
+                        question = json.loads(line)
+                        qid = question['id']
+                        offsets[qid] = offset
+                        by_topic.setdefault(question.get('topic'), set()).add(qid)
+                        for tag in question.get('tags', ()):
+                            by_tag.setdefault(tag, set()).add(qid)
+                        by_difficulty.setdefault(question.get('difficulty'), set()).add(qid)
+                    offset = f.tell()
+            self._by_topic, self._by_tag, self._by_difficulty = by_topic, by_tag, by_difficulty
+            self._offsets = offsets
+
+    def __len__(self):
+        self._index()
+        return len(self._offsets)
+
+    def get(self, question_id):
+        """Récupère une question par son id (None si absente)"""
+        self._index()
+        offset = self._offsets.get(question_id)
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def ids(self, topic=None, tag=None, difficulty=None):
+        """Ids des questions correspondant à tous les filtres donnés"""
+        self._index()
+        selected = set(self._offsets)
+        if topic is not None:
+            selected &= self._by_topic.get(topic, set())
+        if tag is not None:
+            selected &= self._by_tag.get(tag, set())
+        if difficulty is not None:
+            selected &= self._by_difficulty.get(difficulty, set())
+        return sorted(selected)
+
+    def sample(self, k, seed=None, **filters):
+        """Tire k questions au hasard (sans remise), dans un ordre aléatoire"""
+        ids = self.ids(**filters)
+        chosen = random.Random(seed).sample(ids, min(k, len(ids)))
+        return [self.get(qid) for qid in chosen]
@@ -1,73 +1,124 @@
-QUIZ_QUESTIONS = [
-    {
-        "id": 1,
-        "question": "Pour le scénario du Navire, si le coefficient a1 est positif, le navire est instable.",
-        "answer": True,
-        "explanation": "a1 = -C/I. Si a1 > 0, alors C < 0, ce qui signifie que le centre de gravité est trop haut et le navire chavire."
-    },
-    {
-        "id": 2,
-        "question": "Si le discriminant Δ est négatif, la Porte automatique est en régime sous-amorti (elle claque).",
-        "answer": True,
-        "explanation": "Le régime sous-amorti est défini par Δ < 0, ce qui provoque l'oscillation et le claquement."
-    },
-    {
-        "id": 3,
-        "question": "Un Portrait de Phase montrant des spirales rentrantes indique un système asymptotiquement stable.",
-        "answer": True,
-        "explanation": "Les spirales rentrantes correspondent à des valeurs propres complexes avec des parties réelles négatives, typiques d'un foyer stable."
-    },
-    {
-        "id": 4,
-        "question": "L'objectif du réglage d'un Groom (amortisseur) de porte est d'atteindre le régime critique, où le discriminant Δ = 0.",
-        "answer": True,
-        "explanation": "Le régime critique (Δ = 0) est le réglage parfait qui ferme la porte le plus vite possible sans qu'elle ne claque."
-    },
-    {
-        "id": 5,
-        "question": "La stabilité du navire dépend du coefficient a2 et sa vitesse d'arrêt dépend uniquement de a1.",
-        "answer": False,
-        "explanation": "Faux. C'est l'inverse. La stabilité du navire dépend du coefficient a1 (stabilité statique) et sa vitesse d'arrêt dépend uniquement de a2 (frottement)."
-    },
-    {
-        "id": 6,
-        "question": "Un système dont une valeur propre est λ = 0.5 est stable asymptotiquement.",
-        "answer": False,
-        "explanation": "Une partie réelle positive (0.5 > 0) indique que le système est instable."
-    },
-    {
-        "id": 7,
-        "question": "Si la distance Δ(t) entre la trajectoire nominale et perturbée augmente exponentiellement, le système est stable.",
-        "answer": False,
-        "explanation": "Faux. Une distance qui grandit exponentiellement indique une grande sensibilité aux conditions initiales, caractéristique d'un système instable."
-    },
-    {
-        "id": 8,
-        "question": "L'analyse de la trajectoire perturbée sert à tester la robustesse du système face à une erreur de condition initiale.",
-        "answer": True,
-        "explanation": "Exact. On vérifie si une petite erreur de départ est 'oubliée' par le système ou si elle s'amplifie."
-    },
-    {
-        "id": 9,
-        "question": "Si la courbe de séparation des trajectoires tend vers 0 au cours du temps, le système est asymptotiquement stable.",
-        "answer": True,
-        "explanation": "Exact. Cela signifie que la trajectoire perturbée finit par rejoindre la trajectoire nominale à l'équilibre."
-    },
-    {
-        "id": 10,
-        "question": "Un Nœud instable (flèches sortantes) apparaît lorsque les valeurs propres sont réelles et négatives.",
-        "answer": False,
-        "explanation": "Faux. Un Nœud instable est créé par des valeurs propres réelles et positives. Les valeurs négatives créent un Nœud stable."
-    }
-]
+import os
+import time
+
+from question_bank import QuestionBank
+from session_store import create_session_store
+
+# Banque de questions : une question par ligne dans data/quiz_questions.jsonl
+QUESTION_BANK = QuestionBank(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'quiz_questions.jsonl'))
+
+# Nombre de questions tirées pour une session de quiz
+QUIZ_LENGTH = 10
+
+# Sessions de quiz gardées côté serveur ("memory" ou "sqlite:///chemin" pour plusieurs workers)
+SESSION_STORE = create_session_store(os.environ.get('MODSIM_SESSION_STORE', 'memory'))
+
+# Temps de réponse à une question ; la marge couvre l'aller-retour réseau
+QUESTION_TIME_LIMIT = 7  # secondes
+ANSWER_GRACE = 2  # secondes
+
+# Durée de vie d'une session notée : le score reste lisible quelques minutes
+GRADED_SESSION_TTL = 5 * 60  # secondes
 
 def get_question(question_id):
     """Récupère une question par son ID"""
-    for q in QUIZ_QUESTIONS:
-        if q["id"] == question_id:
-            return q
-    return None
+    return QUESTION_BANK.get(question_id)
 
 def get_total_questions():
-    """Retourne le nombre total de questions"""
-    return len(QUIZ_QUESTIONS)
+    """Retourne le nombre de questions d'une session"""
+    return min(QUIZ_LENGTH, len(QUESTION_BANK))
+
+def draw_quiz_session(seed=None, **filters):
+    """Tire les questions d'une session (filtres : topic, tag, difficulty)"""
+    return QUESTION_BANK.sample(get_total_questions(), seed=seed, **filters)
+
+def open_quiz_session(seed=None, **filters):
+    """Tire les questions d'une session et l'enregistre côté serveur ; retourne (id, questions)"""
+    questions = draw_quiz_session(seed=seed, **filters)
+    # la première question est posée dès l'envoi des énoncés
+    session_id = SESSION_STORE.create({"question_ids": [q["id"] for q in questions], "answers": [],
+                                       "issued": [time.time()], "score": None})
+    return session_id, questions
+
+def issue_quiz_question(session_id):
+    """
+    Note l'heure à laquelle la question suivante est posée (bouton Suivant).
+
+    Seule la question qui suit la dernière réponse enregistrée peut être
+    posée, une seule fois. Retourne son indice, ou None.
+    """
+    def issue(session):
+        answers, issued = session["answers"], session["issued"]
+        if session["score"] is None and len(issued) == len(answers) < len(session["question_ids"]):
+            issued.append(time.time())
+        return session
+
+    session = SESSION_STORE.update(session_id, issue) if session_id else None
+    if session is None or len(session["issued"]) != len(session["answers"]) + 1:
+        return None
+    return len(session["answers"])
+
+def record_quiz_answer(session_id, index, answer):
+    """
+    Enregistre la réponse (True, False ou None si temps écoulé) à la question index.
+
+    Les questions se répondent dans l'ordre et une seule fois : une réponse
+    à une autre question que la suivante, ou après le score final, n'est
+    pas enregistrée. Une réponse à une question non posée, ou arrivée plus de
+    QUESTION_TIME_LIMIT + ANSWER_GRACE secondes après qu'elle a été posée,
+    compte comme un temps écoulé (None). Retourne le verdict de la question index
+    {index, correct, answer, explanation} (correct vaut None si le temps
+    est écoulé), ou None si la session a expiré ou si la question n'a pas
+    de réponse enregistrée.
+    """
+    def record(session):
+        answers, issued = session["answers"], session["issued"]
+        if session["score"] is None and index == len(answers) < len(session["question_ids"]):
+            on_time = index < len(issued) and time.time() <= issued[index] + QUESTION_TIME_LIMIT + ANSWER_GRACE
+            answers.append(answer if on_time else None)
+        return session
+
+    if not session_id or not isinstance(index, int) or index < 0:
+        return None
+    session = SESSION_STORE.update(session_id, record)
+    if session is None or index >= len(session["answers"]):
+        return None
+
+    question = get_question(session["question_ids"][index])
+    given = session["answers"][index]
+    return {
+        "index": index,
+        "correct": None if given is None else given == question["answer"],
+        "answer": question["answer"],
+        "explanation": question["explanation"],
+    }
+
+def grade_quiz_session(session_id):
+    """
+    Score final d'une session, à partir des réponses enregistrées sur le serveur.
+
+    Le score est calculé une seule fois ; les réponses arrivées ensuite sont
+    ignorées et la session expire GRADED_SESSION_TTL secondes plus tard.
+    Retourne (score, total), ou None si la session a expiré.
+    """
+    def grade(session):
+        if session["score"] is None:
+            session["score"] = sum(
+                1 for qid, answer in zip(session["question_ids"], session["answers"])
+                if answer is not None and answer == get_question(qid)["answer"]
+            )
+        return session
+
+    session = SESSION_STORE.update(session_id, grade, ttl=GRADED_SESSION_TTL) if session_id else None
+    if session is None:
+        return None
+    return session["score"], len(session["question_ids"])
+
+def export_quiz_bank(questions):
+    """
+    Questions de la session à envoyer au navigateur (store 'quiz-bank').
+
+    Seul l'énoncé est envoyé : la réponse et l'explication restent sur le
+    serveur (voir record_quiz_answer).
+    """
+    return [{"id": q["id"], "question": q["question"]} for q in questions]
@@ -0,0 +1,192 @@
+"""
+Stockage des sessions côté serveur
+
+Les données d'une session (ex. les questions tirées pour un quiz) restent
+sur le serveur ; le navigateur ne garde que l'identifiant de session.
+Deux implémentations partagent la même interface :
+- MemorySessionStore : dictionnaire en mémoire, pour un seul processus ;
+- SQLiteSessionStore : fichier SQLite partagé, pour plusieurs workers
+  gunicorn derrière le même port.
+
+create_session_store choisit l'implémentation à partir d'une URL
+("memory" ou "sqlite:///chemin/vers/sessions.db").
+"""
+import json
+import os
+import secrets
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = 2 * 3600  # secondes
+# les sessions expirées sont supprimées au plus une fois par intervalle, lors d'un create
+PURGE_INTERVAL = 10 * 60  # secondes
+
+
+class SessionStore(ABC):
+    """
+    Interface commune des stockages de sessions.
+
+    Une implémentation incomplète échoue dès sa création (TypeError), pas
+    au milieu d'une requête.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, purge_interval=PURGE_INTERVAL):
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    def create(self, data):
+        """Enregistre une nouvelle session et retourne son identifiant"""
+        now = time.time()
+        # une session abandonnée n'est jamais relue : sans purge elle resterait stockée
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            self.purge()
+        session_id = secrets.token_urlsafe(16)
+        self._write(session_id, data, now + self.ttl)
+        return session_id
+
+    @abstractmethod
+    def get(self, session_id):
+        """Données de la session, ou None si elle n'existe pas ou a expiré"""
+
+    @abstractmethod
+    def update(self, session_id, fn, ttl=None):
+        """
+        Remplace atomiquement les données par fn(données) et les retourne.
+
+        ttl : nouvelle durée de vie à partir de maintenant (None : expiration inchangée).
+        Retourne None (sans appeler fn) si la session n'existe pas ou a expiré.
+        """
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Supprime la session"""
+
+    @abstractmethod
+    def purge(self):
+        """Supprime les sessions expirées"""
+
+    @abstractmethod
+    def _write(self, session_id, data, expires):
+        """Écrit (ou remplace) une session avec sa date d'expiration"""
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions dans un dictionnaire protégé par un verrou (un seul processus)"""
+
+    def __init__(self, ttl=DEFAULT_TTL, purge_interval=PURGE_INTERVAL):
+        super().__init__(ttl, purge_interval)
+        self._lock = threading.Lock()
+        self._sessions = {}  # id -> (expiration, données JSON)
+
+    def _write(self, session_id, data, expires):
+        with self._lock:
+            self._sessions[session_id] = (expires, json.dumps(data))
+
+    def _read(self, session_id):
+        # à appeler avec le verrou
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            del self._sessions[session_id]
+            return None
+        # copie : les données stockées ne sont modifiées que par update
+        return json.loads(entry[1])
+
+    def get(self, session_id):
+        with self._lock:
+            return self._read(session_id)
+
+    def update(self, session_id, fn, ttl=None):
+        with self._lock:
+            data = self._read(session_id)
+            if data is None:
+                return None
+            data = fn(data)
+            expires = self._sessions[session_id][0] if ttl is None else time.time() + ttl
+            self._sessions[session_id] = (expires, json.dumps(data))
+            return data
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge(self):
+        now = time.time()
+        with self._lock:
+            for session_id in [sid for sid, (expires, _) in self._sessions.items() if expires < now]:
+                del self._sessions[session_id]
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions dans un fichier SQLite, partagé entre processus.
+
+    Les mises à jour se font dans une transaction BEGIN IMMEDIATE : deux
+    workers ne peuvent pas modifier la même session en même temps.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, purge_interval=PURGE_INTERVAL):
+        super().__init__(ttl, purge_interval)
+        self.path = path
+        self._local = threading.local()  # une connexion par thread (et par processus)
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS sessions ('
+                         'id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)')
+
+    def _connection(self):
+        # une connexion ouverte avant un fork (gunicorn --preload) n'est pas réutilisée
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    def _write(self, session_id, data, expires):
+        self._connection().execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)',
+                                   (session_id, json.dumps(data), expires))
+
+    def get(self, session_id):
+        row = self._connection().execute('SELECT data FROM sessions WHERE id = ? AND expires >= ?',
+                                         (session_id, time.time())).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def update(self, session_id, fn, ttl=None):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT data FROM sessions WHERE id = ? AND expires >= ?',
+                               (session_id, time.time())).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            data = fn(json.loads(row[0]))
+            if ttl is None:
+                conn.execute('UPDATE sessions SET data = ? WHERE id = ?', (json.dumps(data), session_id))
+            else:
+                conn.execute('UPDATE sessions SET data = ?, expires = ? WHERE id = ?',
+                             (json.dumps(data), time.time() + ttl, session_id))
+            conn.execute('COMMIT')
+            return data
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def delete(self, session_id):
+        self._connection().execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+
+    def purge(self):
+        self._connection().execute('DELETE FROM sessions WHERE expires < ?', (time.time(),))
+
+
+def create_session_store(url='memory', ttl=DEFAULT_TTL):
+    """Crée le stockage décrit par url : "memory" ou "sqlite:///chemin" """
+    if url == 'memory':
+        return MemorySessionStore(ttl)
+    if url.startswith('sqlite:///'):
+        return SQLiteSessionStore(url[len('sqlite:///'):], ttl)
+    raise ValueError(f"Stockage de sessions inconnu : {url}")
@@ -0,0 +1,78 @@
+"""
+Encodage compact des tableaux envoyés au navigateur
+
+Plotly accepte, à la place d'une liste JSON de nombres, un tableau typé
+{dtype, bdata (base64), shape} qu'il lit sans conversion. compact_array
+produit cette forme pour toutes les données de figures (figures complètes
+et mises à jour dash.Patch) ; les float64 y passent en float32 (4 octets
+par valeur au lieu de 8) quand toutes les valeurs finies tiennent dans la
+plage des float32 normaux. La précision relative de ~6e-8 reste bien en
+deçà d'un pixel ; les très grandes distances (systèmes instables sur un
+long horizon) ou les valeurs proches de 0 restent en float64.
+"""
+import base64
+
+import numpy as np
+
+# False : garder les float64 (comparaison dans benchmarks.payload)
+FLOAT32 = True
+
+_FLOAT32_MAX = float(np.finfo(np.float32).max)
+_FLOAT32_TINY = float(np.finfo(np.float32).tiny)
+
+# codes de type de plotly.js
+_PLOTLY_DTYPES = {'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+                  'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8'}
+
+
+def _fits_float32(values):
+    with np.errstate(invalid='ignore'):
+        magnitude = np.abs(values[np.isfinite(values)])
+    nonzero = magnitude[magnitude > 0]
+    return nonzero.size == 0 or (nonzero.max() <= _FLOAT32_MAX and nonzero.min() >= _FLOAT32_TINY)
+
+
+def _narrow_int(values):
+    # plotly.js n'a pas d'entiers 64 bits : plus petit type entier qui contient les valeurs
+    # (float64 au-delà de 32 bits, sans passer en float32 qui perdrait des chiffres)
+    low, high = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.float64)
+
+
+def downcast(values):
+    """
+    float64 réduit en float32 quand la plage le permet, entiers 64 bits
+    réduits au plus petit type entier, autres tableaux inchangés
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        return _narrow_int(values)
+    if FLOAT32 and values.dtype == np.float64 and _fits_float32(values):
+        return values.astype(np.float32)
+    return values
+
+
+def compact_array(values):
+    """
+    Tableau typé Plotly (base64), après downcast.
+
+    Pour de nombreuses tranches d'un même tableau (frames d'une animation),
+    appeler downcast une fois sur le tableau entier évite de refaire le test
+    de plage pour chaque tranche.
+    """
+    values = downcast(values)
+    dtype = _PLOTLY_DTYPES.get(values.dtype.name)
+    if dtype is None or values.size == 0:
+        # tableau vide, booléens, objets... : liste JSON ordinaire
+        return values.tolist()
+
+    # encodage direct, sans passer par l'API privée de plotly
+    # (to_typed_array_spec coûte en plus ~80 µs par appel)
+    spec = {'dtype': dtype, 'bdata': base64.b64encode(np.ascontiguousarray(values)).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
@@ -0,0 +1,37 @@
+"""
+Point d'entrée WSGI du dashboard, pour un serveur de production
+
+    cd src && gunicorn -c gunicorn.conf.py wsgi:server
+
+Avec preload_app (voir gunicorn.conf.py), ce module est importé une seule
+fois par le processus maître, avant le fork : imports NumPy/SciPy, layout,
+index de la banque de questions et figures des scénarios prédéfinis sont
+prêts avant la première requête et partagés par les workers.
+"""
+from main import app, warm_scenario_cache
+from computation import perturbation, phase
+from quiz_data import QUESTION_BANK
+
+server = app.server
+
+
+def warmup():
+    """Charge les modules paresseux et passe une fois par chaque chemin de calcul"""
+    import scipy.integrate  # noqa: F401 (odeint, solve_ivp)
+
+    # index de la banque de questions (construit au premier accès)
+    QUESTION_BANK.ids()
+
+    # sans passer par les caches de calcul, qui resteraient sinon figés dans le maître
+    for methode in ('exacte', 'odeint', 'adaptative'):
+        perturbation.calcul_perturbation.__wrapped__(-1.0, -0.5, 1.0, 0.0, methode=methode)
+    phase.calculer_trajectoires.__wrapped__(-1.0, -0.5, [(1.0, 0.0)])
+    warm_scenario_cache()
+
+    # Dash prépare ses routes, le layout et l'index HTML à la première requête
+    client = server.test_client()
+    for path in ('/', '/_dash-layout', '/_dash-dependencies'):
+        client.get(path)
+
+
+warmup()